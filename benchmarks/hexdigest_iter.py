@@ -0,0 +1,79 @@
+"""
+Benchmark the thread and process backends of `Path.hexdigest_iter()`.
+
+Creates many small files in a temporary directory and prints the throughput of each
+backend and batch size.
+
+```bash
+python benchmarks/hexdigest_iter.py --files 20000 --size 4096
+```
+"""
+
+import argparse
+import os
+import tempfile
+import time
+
+from pathlibutil import Path
+
+
+def create_files(root: Path, count: int, size: int) -> list:
+    files = []
+
+    for i in range(count):
+        file = root.joinpath(f"{i // 1000:03}", f"{i:06}.bin")
+        file.parent.mkdir(exist_ok=True)
+        file.write_bytes(os.urandom(size))
+        files.append(file)
+
+    return files
+
+
+def benchmark(files: list, algorithm: str, **kwargs) -> float:
+    start = time.perf_counter()
+
+    for _, digest in Path.hexdigest_iter(files, algorithm, **kwargs):
+        if isinstance(digest, Exception):
+            raise digest
+
+    return time.perf_counter() - start
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--files", type=int, default=10000)
+    parser.add_argument("--size", type=int, default=4096)
+    parser.add_argument("--algorithm", default="sha256")
+    parser.add_argument("--workers", type=int, default=os.cpu_count())
+    args = parser.parse_args()
+
+    backends = [
+        ("threads", {"batch_size": 1}),
+        ("threads", {"batch_size": 64}),
+        ("processes", {"processes": True, "batch_size": 1}),
+        ("processes", {"processes": True, "batch_size": 16}),
+        ("processes", {"processes": True, "batch_size": 64}),
+        ("processes", {"processes": True, "batch_size": 256}),
+    ]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        files = create_files(Path(tmp), args.files, args.size)
+
+        print(
+            f"{args.files} files of {args.size} bytes, {args.algorithm},"
+            f" {args.workers} workers"
+        )
+
+        for name, kwargs in backends:
+            seconds = benchmark(files, args.algorithm, workers=args.workers, **kwargs)
+
+            print(
+                f"{name:>10} batch_size={kwargs['batch_size']:<4}"
+                f" {seconds:8.3f} s {args.files / seconds:10.0f} files/s"
+            )
+
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
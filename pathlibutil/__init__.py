@@ -2,14 +2,30 @@
 .. include:: ../README.md
 """
 
-from pathlibutil.path import Path, Register7zFormat
-from pathlibutil.types import ByteInt, StatResult, TimeInt, byteint
+from pathlibutil.path import (
+    Path,
+    Register7zFormat,
+    RegisterAdler32Hash,
+    RegisterBlake3Hash,
+    RegisterCrc32Hash,
+    RegisterXxh3_64Hash,
+    RegisterXxh3_128Hash,
+    RegisterXxh64Hash,
+)
+from pathlibutil.types import ByteInt, SizeEstimate, StatResult, TimeInt, byteint
 
 __all__ = [
     "Path",
     "Register7zFormat",
+    "RegisterCrc32Hash",
+    "RegisterAdler32Hash",
+    "RegisterXxh64Hash",
+    "RegisterXxh3_64Hash",
+    "RegisterXxh3_128Hash",
+    "RegisterBlake3Hash",
     "ByteInt",
     "byteint",
     "TimeInt",
     "StatResult",
+    "SizeEstimate",
 ]
@@ -0,0 +1,242 @@
+"""
+Block level hash maps for incremental verification of large files, e.g. images of
+virtual machines which change only in small regions.
+
+A `BlockMap` holds the digest of each block of a file and can be stored in a compact
+binary sidecar file next to it. Later the changed byte ranges of the file are
+detected by comparing the digests of its blocks.
+
+```python
+from pathlibutil.blockmap import BlockMap
+
+BlockMap.from_file("disk.img", "blake2b").save("disk.img.blockmap")
+
+blockmap = BlockMap.load("disk.img.blockmap")
+
+for start, end in blockmap.changes("disk.img"):
+    print(f"bytes {start}-{end} changed")
+```
+"""
+
+import os
+import struct
+from typing import List, Tuple, Union
+
+from pathlibutil.path import Path
+
+_MAGIC = b"PLBM"
+_VERSION = 1
+_HEADER = struct.Struct("<4sBB")
+_SIZES = struct.Struct("<HQQ")
+
+
+class BlockMap:
+    """
+    Digests of all blocks of a file, see `pathlibutil.Path.hexdigest_blocks()`.
+
+    Use `BlockMap.from_file()` to create a block map from a file or
+    `BlockMap.load()` to read it from a sidecar file.
+    """
+
+    def __init__(
+        self,
+        algorithm: str,
+        block_size: int,
+        size: int,
+        digests: List[bytes],
+    ) -> None:
+        self.algorithm = algorithm
+        """
+        Name of the hash algorithm.
+        """
+        self.block_size = block_size
+        """
+        Size of each block in bytes, the last block can be shorter.
+        """
+        self.size = size
+        """
+        Size of the file in bytes.
+        """
+        self.digests = digests
+        """
+        List with the binary digest of each block.
+        """
+
+    def __repr__(self) -> str:
+        return (
+            f"{self.__class__.__name__}(algorithm='{self.algorithm}',"
+            f" block_size={self.block_size}, size={self.size},"
+            f" blocks={len(self.digests)})"
+        )
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, BlockMap):
+            return NotImplemented
+
+        return (
+            self.algorithm == other.algorithm
+            and self.block_size == other.block_size
+            and self.size == other.size
+            and self.digests == other.digests
+        )
+
+    @classmethod
+    def from_file(
+        cls,
+        file: Union[str, os.PathLike],
+        algorithm: str = None,
+        *,
+        block_size: int = 2**20,
+        **kwargs,
+    ) -> "BlockMap":
+        """
+        Creates a block map by hashing all blocks of a `file`.
+
+        For `algorithm` and `**kwargs`, e.g. `workers`, see
+        `pathlibutil.Path.hexdigest_blocks()`. Variable length algorithms are not
+        supported.
+        """
+        file = Path(file)
+        algorithm = algorithm or file.default_hash
+        size = os.stat(file).st_size
+
+        _, leaves = file.hexdigest_blocks(algorithm, block_size=block_size, **kwargs)
+
+        return cls(algorithm, block_size, size, [bytes.fromhex(d) for d in leaves])
+
+    @property
+    def root(self) -> str:
+        """
+        Root hexdigest of the block map, which is equal to the root of
+        `pathlibutil.Path.hexdigest_blocks()`.
+        """
+        hash = Path._new_hash(self.algorithm)
+
+        for digest in self.digests:
+            hash.update(digest)
+
+        return hash.hexdigest()
+
+    def to_bytes(self) -> bytes:
+        """
+        Returns the binary sidecar format of the block map.
+
+        - 4 bytes magic `PLBM`, 1 byte version and 1 byte length of the algorithm name
+        - algorithm name in ascii
+        - 2 bytes digest size, 8 bytes block size and 8 bytes file size
+        - digests of all blocks
+
+        All integers are unsigned little endian.
+        """
+        name = self.algorithm.encode("ascii")
+        digest_size = len(self.digests[0]) if self.digests else 0
+
+        return b"".join(
+            [
+                _HEADER.pack(_MAGIC, _VERSION, len(name)),
+                name,
+                _SIZES.pack(digest_size, self.block_size, self.size),
+                *self.digests,
+            ]
+        )
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> "BlockMap":
+        """
+        Creates a block map from its binary sidecar format, see `to_bytes()`.
+
+        A `ValueError` is raised if `data` is not a valid block map.
+        """
+        try:
+            magic, version, length = _HEADER.unpack_from(data)
+        except struct.error as e:
+            raise ValueError("invalid block map") from e
+
+        if magic != _MAGIC or version != _VERSION:
+            raise ValueError("invalid block map")
+
+        start = _HEADER.size
+        offset = start + length
+        algorithm = data[start:offset].decode("ascii")
+
+        try:
+            digest_size, block_size, size = _SIZES.unpack_from(data, offset)
+        except struct.error as e:
+            raise ValueError("invalid block map") from e
+
+        offset += _SIZES.size
+        count = max(1, -(-size // block_size)) if block_size else 0
+
+        if len(data) - offset != count * digest_size:
+            raise ValueError("invalid block map")
+
+        digests = []
+
+        for _ in range(count):
+            end = offset + digest_size
+            digests.append(data[offset:end])
+            offset = end
+
+        return cls(algorithm, block_size, size, digests)
+
+    def save(self, sidecar: Union[str, os.PathLike]) -> Path:
+        """
+        Writes the block map to a `sidecar` file and returns its path.
+        """
+        sidecar = Path(sidecar)
+        sidecar.write_bytes(self.to_bytes())
+
+        return sidecar
+
+    @classmethod
+    def load(cls, sidecar: Union[str, os.PathLike]) -> "BlockMap":
+        """
+        Reads a block map from a `sidecar` file.
+        """
+        return cls.from_bytes(Path(sidecar).read_bytes())
+
+    def changes(self, file: Union[str, os.PathLike], **kwargs) -> List[Tuple[int, int]]:
+        """
+        Returns a list of changed byte ranges `(start, end)` of the `file` compared to
+        the block map, `end` is exclusive. Adjacent blocks are merged into one range.
+
+        Every block of the file is hashed, but only the digests are kept in memory.
+        If the file has grown or shrunk, the range beyond the shorter size is
+        reported as changed.
+
+        For `**kwargs` see `from_file()`.
+        """
+        current = self.from_file(
+            file, self.algorithm, block_size=self.block_size, **kwargs
+        )
+
+        end = max(self.size, current.size)
+        ranges = []
+
+        for index in range(max(len(self.digests), len(current.digests))):
+            old = self.digests[index] if index < len(self.digests) else None
+            new = current.digests[index] if index < len(current.digests) else None
+
+            if old == new:
+                continue
+
+            start = index * self.block_size
+            stop = min(start + self.block_size, end)
+
+            if ranges and ranges[-1][1] == start:
+                ranges[-1] = (ranges[-1][0], stop)
+            else:
+                ranges.append((start, stop))
+
+        return ranges
+
+    def verify(self, file: Union[str, os.PathLike], **kwargs) -> bool:
+        """
+        Returns `True` if the `file` did not change compared to the block map.
+
+        For `**kwargs` see `from_file()`.
+        """
+        return not self.changes(file, **kwargs)
+
+
+__all__ = ["BlockMap"]
@@ -0,0 +1,226 @@
+"""
+Persistent cache for file digests stored in a `sqlite3` database.
+
+Cached digests are keyed by `(st_dev, st_ino, st_size, st_mtime_ns, algorithm)` of
+the file, so a file which was not modified costs only one `stat()` call instead of
+reading its content.
+
+```python
+from pathlibutil import Path
+from pathlibutil.cache import DigestCache
+
+Path.digest_cache = DigestCache("digests.sqlite", max_entries=1_000_000)
+
+digest = Path("file.iso").hexdigest("sha256")  # reads and hashes the file
+digest = Path("file.iso").hexdigest("sha256")  # returns the cached digest
+```
+"""
+
+import os
+import sqlite3
+import threading
+import time
+from typing import Optional, Union
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS digests (
+    st_dev INTEGER NOT NULL,
+    st_ino INTEGER NOT NULL,
+    st_size INTEGER NOT NULL,
+    st_mtime_ns INTEGER NOT NULL,
+    algorithm TEXT NOT NULL,
+    digest TEXT NOT NULL,
+    path TEXT NOT NULL,
+    used INTEGER NOT NULL,
+    PRIMARY KEY (st_dev, st_ino, st_size, st_mtime_ns, algorithm)
+);
+CREATE INDEX IF NOT EXISTS digests_used ON digests (used);
+CREATE INDEX IF NOT EXISTS digests_path ON digests (path);
+"""
+
+
+class DigestCache:
+    """
+    Cache for file digests which can be assigned to `pathlibutil.Path.digest_cache`.
+
+    The `database` is a filename or `":memory:"` for a cache which lives only as long
+    as the object.
+
+    If `max_entries` is set, the least recently used digests are evicted as soon as
+    the cache grows beyond this number of entries.
+
+    The cache can be shared by multiple threads, e.g. `Path.hexdigest_iter()`.
+
+    >>> cache = DigestCache()
+    >>> cache.set(os.stat("LICENSE"), "md5", "b720c6d9fa5e0473f8d86461dbb43caf")
+    >>> cache.get(os.stat("LICENSE"), "md5")
+    'b720c6d9fa5e0473f8d86461dbb43caf'
+    """
+
+    def __init__(
+        self,
+        database: Union[str, os.PathLike] = ":memory:",
+        *,
+        max_entries: int = None,
+    ) -> None:
+        if max_entries is not None and max_entries < 1:
+            raise ValueError(
+                f"max_entries must be a positive integer, got '{max_entries}'"
+            )
+
+        self.max_entries = max_entries
+        """
+        Maximum number of cached digests, `None` for an unlimited cache.
+        """
+
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(
+            os.fspath(database),
+            check_same_thread=False,
+            isolation_level=None,
+        )
+        self._db.executescript(_SCHEMA)
+        self._count = self._db.execute("SELECT COUNT(*) FROM digests").fetchone()[0]
+
+    @staticmethod
+    def _key(stat: os.stat_result, algorithm: str) -> tuple:
+        """
+        Returns the primary key of a digest.
+        """
+        return (
+            stat.st_dev,
+            stat.st_ino,
+            stat.st_size,
+            stat.st_mtime_ns,
+            algorithm,
+        )
+
+    @staticmethod
+    def _path(path: Union[str, os.PathLike]) -> str:
+        """
+        Returns the normalized absolute path which is stored with the digests.
+        """
+        return os.path.normcase(os.path.abspath(path))
+
+    def get(self, stat: os.stat_result, algorithm: str) -> Optional[str]:
+        """
+        Returns the cached digest of a file with the given `stat` result or `None` if
+        it is not cached.
+        """
+        key = self._key(stat, algorithm)
+
+        with self._lock:
+            row = self._db.execute(
+                "SELECT digest FROM digests WHERE st_dev = ? AND st_ino = ?"
+                " AND st_size = ? AND st_mtime_ns = ? AND algorithm = ?",
+                key,
+            ).fetchone()
+
+            if row is None:
+                return None
+
+            if self.max_entries is not None:
+                self._db.execute(
+                    "UPDATE digests SET used = ? WHERE st_dev = ? AND st_ino = ?"
+                    " AND st_size = ? AND st_mtime_ns = ? AND algorithm = ?",
+                    (time.time_ns(), *key),
+                )
+
+        return row[0]
+
+    def set(
+        self,
+        stat: os.stat_result,
+        algorithm: str,
+        digest: str,
+        path: Union[str, os.PathLike] = "",
+    ) -> None:
+        """
+        Stores the `digest` of a file with the given `stat` result.
+
+        The `path` of the file is only needed to `invalidate()` the digest later on.
+        """
+        key = self._key(stat, algorithm)
+        path = self._path(path) if path else ""
+
+        with self._lock, self._db:
+            self._db.execute("BEGIN")
+
+            deleted = self._db.execute(
+                "DELETE FROM digests WHERE st_dev = ? AND st_ino = ?"
+                " AND algorithm = ?",
+                (stat.st_dev, stat.st_ino, algorithm),
+            ).rowcount
+
+            self._db.execute(
+                "INSERT INTO digests VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (*key, digest, path, time.time_ns()),
+            )
+
+            self._count += 1 - deleted
+
+            if self.max_entries is not None and self._count > self.max_entries:
+                self._count -= self._db.execute(
+                    "DELETE FROM digests WHERE rowid IN"
+                    " (SELECT rowid FROM digests ORDER BY used LIMIT ?)",
+                    (self._count - self.max_entries,),
+                ).rowcount
+
+    def invalidate(
+        self, path: Union[str, os.PathLike] = None, *, algorithm: str = None
+    ) -> int:
+        """
+        Removes cached digests and returns the number of removed entries.
+
+        - If `path` is a file its digests are removed, if it is a directory the
+        digests of all files in the directory tree are removed.
+        - If `algorithm` is given only digests of this algorithm are removed.
+        - Without arguments the whole cache is cleared.
+        """
+        query = "DELETE FROM digests WHERE 1"
+        params = []
+
+        if path is not None:
+            path = self._path(path)
+            prefix = path.rstrip(os.sep) + os.sep
+
+            query += " AND (path = ? OR substr(path, 1, ?) = ?)"
+            params += [path, len(prefix), prefix]
+
+        if algorithm is not None:
+            query += " AND algorithm = ?"
+            params.append(algorithm)
+
+        with self._lock:
+            count = self._db.execute(query, params).rowcount
+            self._count -= count
+
+        return count
+
+    def clear(self) -> None:
+        """
+        Removes all cached digests.
+        """
+        self.invalidate()
+
+    def close(self) -> None:
+        """
+        Closes the database connection.
+        """
+        with self._lock:
+            self._db.close()
+
+    def __len__(self) -> int:
+        """
+        Returns the number of cached digests.
+        """
+        return self._count
+
+    def __enter__(self) -> "DigestCache":
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.close()
+
+
+__all__ = ["DigestCache"]
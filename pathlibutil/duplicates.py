@@ -0,0 +1,242 @@
+"""
+Find duplicate files in one or more directory trees.
+
+Files are compared in stages, so most of them are never read completely:
+
+1. files are grouped by `st_size` from a single walk over all directory trees
+2. files of the same size are grouped by a fingerprint of their head, middle and
+tail, see `pathlibutil.Path.hexdigest()`
+3. files with the same fingerprint are grouped by the hexdigest of their content
+
+```python
+from pathlibutil.duplicates import DuplicateStats, find_duplicates
+
+stats = DuplicateStats()
+
+for group in find_duplicates(["/mnt/share", "/mnt/backup"], "sha256", stats=stats):
+    print(*group, sep="\\n", end="\\n\\n")
+
+print(f"{stats.wasted} can be freed, hashing skipped {stats.saved}")
+```
+"""
+
+import collections
+import concurrent.futures
+import os
+from dataclasses import dataclass, field
+from typing import Dict, Generator, Iterable, List, Tuple, Union
+
+from pathlibutil.path import Path, _imap_bounded, _workers
+from pathlibutil.types import ByteInt
+
+
+@dataclass
+class DuplicateStats:
+    """
+    Statistics about the stages of `find_duplicates()`.
+
+    All attributes are updated while the duplicate groups are yielded.
+    """
+
+    files: int = 0
+    """
+    Number of files found in all directory trees.
+    """
+    total: ByteInt = field(default_factory=ByteInt)
+    """
+    Total size of all files found.
+    """
+    size_saved: ByteInt = field(default_factory=ByteInt)
+    """
+    Bytes which were not read, because the size of the file is unique.
+    """
+    fingerprint_read: ByteInt = field(default_factory=ByteInt)
+    """
+    Bytes which were read to compare fingerprints.
+    """
+    fingerprint_saved: ByteInt = field(default_factory=ByteInt)
+    """
+    Bytes which were not read completely, because the fingerprint is unique.
+    """
+    content_read: ByteInt = field(default_factory=ByteInt)
+    """
+    Bytes which were read to compare hexdigests of the whole content.
+    """
+    duplicates: int = 0
+    """
+    Number of files which are duplicates of another file.
+    """
+    wasted: ByteInt = field(default_factory=ByteInt)
+    """
+    Bytes which could be freed by removing all duplicates.
+    """
+
+    @property
+    def saved(self) -> ByteInt:
+        """
+        Total bytes which were not read compared to hashing all files completely.
+
+        >>> DuplicateStats(total=100, fingerprint_read=10, content_read=20).saved
+        70
+        """
+        return self.total - self.fingerprint_read - self.content_read
+
+
+def _group_by_size(
+    roots: Iterable[Union[str, os.PathLike]],
+    min_size: int,
+    stats: DuplicateStats,
+) -> Dict[int, List[str]]:
+    """
+    Walks all directory trees and returns a dict with lists of filenames by size.
+
+    Hardlinks and files found twice in overlapping trees are only listed once.
+    """
+    sizes = collections.defaultdict(list)
+    inodes = set()
+
+    for root in map(Path, roots):
+        files = [root] if root.is_file() else root.iterdir(recursive=True)
+
+        for file in files:
+            try:
+                stat = os.stat(file)
+            except OSError:
+                continue
+
+            inode = (stat.st_dev, stat.st_ino)
+
+            if inode in inodes:
+                continue
+
+            inodes.add(inode)
+
+            stats.files += 1
+            stats.total += stat.st_size
+
+            if stat.st_size >= min_size:
+                sizes[stat.st_size].append(os.fspath(file))
+
+    return sizes
+
+
+def _group_by_digest(
+    files: Iterable[str], algorithm: str, **kwargs
+) -> Generator[List[str], None, None]:
+    """
+    Yields groups of at least two `files` with equal hexdigests, files which can not
+    be read are skipped.
+    """
+    groups = collections.defaultdict(list)
+
+    for file in files:
+        try:
+            digest = Path(file).hexdigest(algorithm, **kwargs)
+        except OSError:
+            continue
+
+        groups[digest].append(file)
+
+    yield from (group for group in groups.values() if len(group) > 1)
+
+
+def _compare(
+    item: Tuple[int, List[str]], algorithm: str, sample: int
+) -> Tuple[List[List[str]], Dict[str, int]]:
+    """
+    Compares files of the same size by fingerprint and hexdigest and returns the
+    duplicate groups and the number of bytes read and saved by each stage.
+    """
+    size, files = item
+    fingerprint_size = min(size, 3 * sample)
+
+    read = {
+        "fingerprint_read": len(files) * fingerprint_size,
+        "fingerprint_saved": 0,
+        "content_read": 0,
+    }
+
+    groups = []
+    unique = len(files)
+
+    for group in _group_by_digest(files, algorithm, fingerprint=sample):
+        if size <= 3 * sample:
+            # the fingerprint already covers the whole content
+            groups.append(group)
+            continue
+
+        unique -= len(group)
+        read["content_read"] += len(group) * size
+        groups.extend(_group_by_digest(group, algorithm))
+
+    read["fingerprint_saved"] = unique * (size - fingerprint_size)
+
+    return groups, read
+
+
+def find_duplicates(
+    roots: Union[str, os.PathLike, Iterable[Union[str, os.PathLike]]],
+    algorithm: str = None,
+    *,
+    sample: int = 2**12,
+    min_size: int = 1,
+    workers: int = None,
+    stats: DuplicateStats = None,
+) -> Generator[List[Path], None, None]:
+    """
+    Yields lists of files with identical content from all directory trees in `roots`.
+
+    - `algorithm` is used for fingerprints and hexdigests (default:
+    `Path.default_hash`)
+    - `sample` is the size of each sample of a fingerprint in bytes
+    - files smaller than `min_size` are ignored, by default empty files
+    - files of the same size are compared in a pool of `workers` threads, groups are
+    yielded as soon as all files of a size are compared
+    - `stats` is updated with the number of bytes read and saved by each stage
+
+    Only lists of filenames are held in memory, not the content of any file.
+    Hardlinks to the same file are not reported as duplicates.
+
+    >>> list(find_duplicates(["photos", "backup"]))
+    [[Path('backup/2024/img_0001.jpg'), Path('photos/img_0001.jpg')]]
+    """
+    if isinstance(roots, (str, os.PathLike)):
+        roots = [roots]
+
+    if stats is None:
+        stats = DuplicateStats()
+
+    sizes = _group_by_size(roots, min_size, stats)
+
+    for size, files in list(sizes.items()):
+        if len(files) < 2:
+            stats.size_saved += size
+            del sizes[size]
+
+    algorithm = algorithm or Path.default_hash
+
+    def compare(item: Tuple[int, List[str]]):
+        return _compare(item, algorithm, sample)
+
+    workers = _workers(workers)
+
+    with concurrent.futures.ThreadPoolExecutor(workers) as executor:
+        for (size, _), result in _imap_bounded(
+            executor, compare, sizes.items(), workers=workers
+        ):
+            if isinstance(result, Exception):
+                raise result
+
+            groups, read = result
+
+            for name, value in read.items():
+                setattr(stats, name, getattr(stats, name) + value)
+
+            for group in groups:
+                stats.duplicates += len(group) - 1
+                stats.wasted += (len(group) - 1) * size
+
+                yield sorted(map(Path, group))
+
+
+__all__ = ["find_duplicates", "DuplicateStats"]
@@ -0,0 +1,415 @@
+"""
+Include and exclude glob patterns for directory tree traversals with
+`Path.iterdir()`, `Path.walk()`, `Path.scantree()` and `Path.size()`.
+
+All patterns are compiled once into a single regular expression, subdirectories are
+pruned before they are entered and files are matched on their relative path as
+`str` without creating `Path` objects.
+
+```python
+from pathlibutil import Path
+
+files = Path("project").iterdir(
+    recursive=True,
+    include=["*.py", "*.md"],
+    exclude=[".git/", "node_modules/", "**/tests/**"],
+)
+```
+
+Patterns follow the `.gitignore` syntax:
+
+- `*` matches anything except `/`, `?` one character and `[...]` a character class
+- `**` matches any number of directories, e.g. `**/*.log` or `logs/**`
+- a pattern containing a `/` is matched against the path relative to the top
+  directory, otherwise against the name of the file or directory at any depth
+- a trailing `/` matches directories only, e.g. `.git/` or `node_modules/`
+
+`GitIgnore` loads `.gitignore` files while the tree is walked and skips everything
+they ignore, pass it or the names of the ignore files as `ignore` keyword-argument.
+
+```python
+files = Path("project").iterdir(recursive=True, ignore=".gitignore")
+archive = Path("project").make_archive("project.zip", ignore=GitIgnore())
+```
+"""
+
+import functools
+import os
+import re
+from typing import Iterable, List, Optional, Tuple, Union
+
+Patterns = Union[str, Iterable[str]]
+
+
+def _translate_glob(pattern: str) -> str:
+    """
+    Translates a glob pattern without a trailing slash into a regular expression.
+    """
+    anchored = "/" in pattern
+    pattern = pattern.lstrip("/")
+    result = [] if anchored else ["(?:.*/)?"]
+    i, n = 0, len(pattern)
+
+    while i < n:
+        c = pattern[i]
+
+        if pattern.startswith("**", i):
+            if i + 2 == n:
+                result.append(".*")
+            elif pattern[i + 2] == "/":
+                result.append("(?:.*/)?")
+                i += 1
+            else:
+                result.append("[^/]*")
+            i += 2
+            continue
+
+        if c == "\\" and i + 1 < n:
+            i += 1
+            result.append(re.escape(pattern[i]))
+        elif c == "*":
+            result.append("[^/]*")
+        elif c == "?":
+            result.append("[^/]")
+        elif c == "[":
+            j = pattern.find("]", i + 2)
+
+            if j == -1:
+                result.append(re.escape(c))
+            else:
+                chars = pattern[i:j][1:]
+
+                if chars[0] in "!^":
+                    chars = "^" + chars[1:]
+
+                result.append("[" + chars.replace("\\", "\\\\") + "]")
+                i = j
+        else:
+            result.append(re.escape(c))
+        i += 1
+
+    return "".join(result)
+
+
+def _compile(patterns: List[str]) -> Optional["re.Pattern[str]"]:
+    """
+    Compiles glob patterns into one regular expression, `None` if it is empty.
+    """
+    if not patterns:
+        return None
+
+    return re.compile("|".join(f"(?:{_translate_glob(p)})" for p in patterns))
+
+
+def _split(patterns: Optional[Patterns]) -> Tuple[List[str], List[str]]:
+    """
+    Returns two lists, patterns for any path and patterns for directories only.
+    """
+    if patterns is None:
+        patterns = []
+    elif isinstance(patterns, str):
+        patterns = [patterns]
+
+    paths, dirs = [], []
+
+    for pattern in patterns:
+        if not pattern or pattern.strip("/") == "":
+            raise ValueError(f"invalid pattern: {pattern!r}")
+
+        if pattern.endswith("/"):
+            dirs.append(pattern.rstrip("/"))
+        else:
+            paths.append(pattern)
+
+    return paths, dirs
+
+
+class GlobFilter:
+    """
+    Compiled `include` and `exclude` glob patterns.
+
+    A file is accepted if it matches any `include` pattern, or `include` is empty,
+    and no `exclude` pattern. A directory is entered if it matches no `exclude`
+    pattern, `include` patterns are only matched against files.
+
+    >>> f = GlobFilter(include="*.py", exclude=[".git/", "**/build/**"])
+    >>> f.accept_file("src/main.py"), f.accept_dir("src/.git")
+    (True, False)
+    """
+
+    __slots__ = ("_include", "_exclude_files", "_exclude_dirs")
+
+    def __init__(
+        self,
+        include: Optional[Patterns] = None,
+        exclude: Optional[Patterns] = None,
+    ) -> None:
+        include, include_dirs = _split(include)
+
+        if include_dirs:
+            raise ValueError("include patterns must not end with a '/'")
+
+        exclude, exclude_dirs = _split(exclude)
+
+        self._include = _compile(include)
+        self._exclude_files = _compile(exclude)
+        self._exclude_dirs = _compile(exclude + exclude_dirs)
+
+    @classmethod
+    def from_patterns(
+        cls,
+        include: Optional[Patterns] = None,
+        exclude: Optional[Patterns] = None,
+    ) -> Optional["GlobFilter"]:
+        """
+        Returns a `GlobFilter` or `None` if there are no patterns at all.
+        """
+        if not include and not exclude:
+            return None
+
+        return cls(include, exclude)
+
+    def for_directory(self, path: str, relpath: str) -> "GlobFilter":
+        """
+        Returns the filter for the entries of a directory, which is the same for all
+        directories.
+        """
+        return self
+
+    def accept_file(self, relpath: str) -> bool:
+        """
+        Returns `True` if the file with the posix `relpath` passes the filter.
+        """
+        if self._exclude_files and self._exclude_files.fullmatch(relpath):
+            return False
+
+        return self._include is None or self._include.fullmatch(relpath) is not None
+
+    def accept_dir(self, relpath: str) -> bool:
+        """
+        Returns `True` if the directory with the posix `relpath` should be entered.
+        """
+        return (
+            self._exclude_dirs is None or self._exclude_dirs.fullmatch(relpath) is None
+        )
+
+
+def _parse_ignore(lines: Iterable[str]) -> List[Tuple[str, bool, bool]]:
+    """
+    Returns a list of `(pattern, negate, dir_only)` for the lines of an ignore file.
+    """
+    rules = []
+
+    for line in lines:
+        line = line.rstrip("\r\n")
+
+        if not line or line.startswith("#"):
+            continue
+
+        pattern = line.rstrip(" ")
+
+        if pattern.endswith("\\") and len(pattern) < len(line):
+            pattern += " "
+
+        negate = pattern.startswith("!")
+
+        if negate:
+            pattern = pattern[1:]
+        elif pattern.startswith(("\\!", "\\#")):
+            pattern = pattern[1:]
+
+        dir_only = pattern.endswith("/")
+        pattern = pattern.rstrip("/")
+
+        if pattern:
+            rules.append((pattern, negate, dir_only))
+
+    return rules
+
+
+def _compile_rules(
+    rules: List[Tuple[str, bool]],
+) -> Optional[Tuple["re.Pattern[str]", List[bool]]]:
+    """
+    Compiles `(pattern, negate)` rules into one regular expression, the alternatives
+    are reversed, so `lastindex` of a match is the index of the last matching rule.
+    """
+    if not rules:
+        return None
+
+    rules = rules[::-1]
+    regex = re.compile("|".join(f"({_translate_glob(p)})" for p, _ in rules))
+
+    return regex, [negate for _, negate in rules]
+
+
+@functools.lru_cache(maxsize=256)
+def _compile_ignore(text: str) -> Tuple[Optional[tuple], Optional[tuple]]:
+    """
+    Returns the compiled rules for files and for directories of an ignore file.
+    """
+    rules = _parse_ignore(text.splitlines())
+
+    files = _compile_rules([(p, n) for p, n, dir_only in rules if not dir_only])
+    dirs = _compile_rules([(p, n) for p, n, _ in rules])
+
+    return files, dirs
+
+
+class GitIgnore:
+    """
+    Filter with the semantics of `.gitignore` files, which are loaded from each
+    directory while the tree is walked.
+
+    Patterns of an ignore file are relative to its directory and are matched with the
+    `pathlibutil.filters` glob syntax. The last matching pattern wins, a `!` negates
+    a pattern and re-includes a path, and ignore files of subdirectories take
+    precedence over those of their parents. Ignored directories are not entered, so
+    files in them can not be re-included, like with git.
+
+    - `filenames` of the ignore files, e.g. `[".gitignore", ".dockerignore"]`, the
+    rules of all files of a directory are concatenated in this order
+    - `rules` additional patterns for the top directory, e.g. `[".git/"]`
+
+    Only ignore files of the walked directory tree are loaded, not the ones of its
+    parent directories. The compiled rules of each directory are cached and shared by
+    all files and subdirectories below it.
+
+    >>> ignore = GitIgnore(rules=["*.log", "!keep.log"])
+    >>> ignore.accept_file("debug.log"), ignore.accept_file("logs/keep.log")
+    (False, True)
+    """
+
+    __slots__ = ("_filenames", "_parent", "_base", "_files", "_dirs")
+
+    def __init__(
+        self,
+        filenames: Patterns = ".gitignore",
+        *,
+        rules: Optional[Iterable[str]] = None,
+    ) -> None:
+        if isinstance(filenames, str):
+            filenames = [filenames]
+
+        self._filenames = tuple(filenames)
+        self._parent = None
+        self._base = ""
+        self._files, self._dirs = _compile_ignore("\n".join(rules or []))
+
+    @classmethod
+    def _level(cls, parent: "GitIgnore", base: str, text: str) -> "GitIgnore":
+        """
+        Returns the filter of a directory with an ignore file.
+        """
+        level = cls.__new__(cls)
+        level._filenames = parent._filenames
+        level._parent = parent
+        level._base = base
+        level._files, level._dirs = _compile_ignore(text)
+
+        return level
+
+    def _ignored(self, relpath: str, is_dir: bool) -> bool:
+        """
+        Returns `True` if the last matching rule of the nearest ignore file ignores
+        the path.
+        """
+        level = self
+
+        while level is not None:
+            compiled = level._dirs if is_dir else level._files
+
+            if compiled is not None:
+                regex, negates = compiled
+                match = regex.fullmatch(relpath, len(level._base))
+
+                if match is not None:
+                    return not negates[match.lastindex - 1]
+
+            level = level._parent
+
+        return False
+
+    def for_directory(self, path: str, relpath: str) -> "GitIgnore":
+        """
+        Loads the ignore files of a directory and returns the filter for its entries.
+
+        - `path` of the directory
+        - `relpath` of the directory with a trailing `/` or `""` for the top directory
+        """
+        texts = []
+
+        for filename in self._filenames:
+            try:
+                with open(os.path.join(path, filename), encoding="utf-8") as f:
+                    texts.append(f.read())
+            except (OSError, UnicodeDecodeError):
+                continue
+
+        if not texts:
+            return self
+
+        return self._level(self, relpath, "\n".join(texts))
+
+    def accept_file(self, relpath: str) -> bool:
+        """
+        Returns `True` if the file with the posix `relpath` is not ignored.
+        """
+        return not self._ignored(relpath, False)
+
+    def accept_dir(self, relpath: str) -> bool:
+        """
+        Returns `True` if the directory with the posix `relpath` is not ignored.
+        """
+        return not self._ignored(relpath, True)
+
+
+class _Filters:
+    """
+    Chain of filters which all have to accept a path.
+    """
+
+    __slots__ = ("filters",)
+
+    def __init__(self, filters: list) -> None:
+        self.filters = filters
+
+    def for_directory(self, path: str, relpath: str) -> "_Filters":
+        return _Filters([f.for_directory(path, relpath) for f in self.filters])
+
+    def accept_file(self, relpath: str) -> bool:
+        return all(f.accept_file(relpath) for f in self.filters)
+
+    def accept_dir(self, relpath: str) -> bool:
+        return all(f.accept_dir(relpath) for f in self.filters)
+
+
+Filter = Union[GlobFilter, GitIgnore, _Filters]
+
+
+def _make_filter(
+    include: Optional[Patterns] = None,
+    exclude: Optional[Patterns] = None,
+    ignore: Union[Patterns, GitIgnore, None] = None,
+) -> Optional[Filter]:
+    """
+    Returns one filter for `include` and `exclude` patterns and `ignore` files or
+    `None` if there is nothing to filter.
+    """
+    filters = []
+
+    if include or exclude:
+        filters.append(GlobFilter(include, exclude))
+
+    if isinstance(ignore, GitIgnore):
+        filters.append(ignore)
+    elif ignore:
+        filters.append(GitIgnore(ignore))
+
+    if not filters:
+        return None
+
+    return filters[0] if len(filters) == 1 else _Filters(filters)
+
+
+__all__ = ["GlobFilter", "GitIgnore"]
@@ -0,0 +1,249 @@
+"""
+Read, write and verify checksum manifests like `SHA256SUMS` or `files.md5`, which are
+compatible with `sha256sum --check` or `md5sum --check`.
+
+Each line holds a hexdigest and a filename relative to the directory of the manifest,
+optionally the size of the file in bytes can be written between them, lines starting
+with `#` are comments.
+
+```text
+# sha256 checksums
+e3b0c44298fc1c149afbf4c8996fb92427ae41e4649b934ca495991b7852b855 *data/empty.txt
+a948904f2f0f479b8f8197694b30184b0d2ed1c1cd2a1ec0fb85d299a192a447 12 *data/file.txt
+```
+
+BSD style lines like `SHA256 (data/file.txt) = a948904f...` can be read as well.
+
+```python
+from pathlibutil import Path
+from pathlibutil.manifest import verify_manifest, write_manifest
+
+manifest = write_manifest("SHA256SUMS", Path("data").iterdir(recursive=True))
+
+for path, result in verify_manifest(manifest):
+    if result is not True:
+        print(f"{path}: FAILED {result or ''}")
+```
+"""
+
+import concurrent.futures
+import os
+import re
+from typing import Generator, Iterable, NamedTuple, Optional, Tuple, Union
+
+from pathlibutil.path import Path, _imap_bounded, _workers
+
+
+class ManifestEntry(NamedTuple):
+    """
+    Entry of a checksum manifest.
+    """
+
+    digest: str
+    """
+    Hexdigest of the file in lower case.
+    """
+    filename: str
+    """
+    Filename as written in the manifest.
+    """
+    size: Optional[int] = None
+    """
+    Size of the file in bytes, if the manifest carries one.
+    """
+    algorithm: Optional[str] = None
+    """
+    Name of the hash algorithm, if the manifest carries one (BSD style).
+    """
+
+
+_GNU = re.compile(r"^(?P<digest>[0-9a-fA-F]+) (?P<mode>[ *])(?P<filename>.+)$")
+_SIZE = re.compile(
+    r"^(?P<digest>[0-9a-fA-F]+) (?P<size>\d+) (?P<mode>[ *])(?P<filename>.+)$"
+)
+_BSD = re.compile(
+    r"^(?P<algorithm>[\w-]+) \((?P<filename>.+)\) = (?P<digest>[0-9a-fA-F]+)$"
+)
+
+
+def _escape(filename: str) -> Tuple[str, str]:
+    """
+    Escapes backslashes and newlines in a filename like `sha256sum`, returns the
+    escaped filename and the prefix of the line.
+    """
+    if "\\" not in filename and "\n" not in filename:
+        return filename, ""
+
+    return filename.replace("\\", "\\\\").replace("\n", "\\n"), "\\"
+
+
+def _unescape(filename: str) -> str:
+    """
+    Reverts `_escape()`.
+    """
+    return re.sub(r"\\(.)", lambda m: "\n" if m[1] == "n" else m[1], filename)
+
+
+def _algorithm(manifest: Path, algorithm: str = None) -> str:
+    """
+    Returns the `algorithm` or guesses it from the name of the `manifest`.
+    """
+    if algorithm:
+        return algorithm
+
+    name = manifest.name.lower().replace("-", "")
+
+    for candidate in sorted(Path().algorithms_available, key=len, reverse=True):
+        if candidate.replace("-", "") in name:
+            return candidate
+
+    return Path.default_hash
+
+
+def read_manifest(
+    manifest: Union[str, os.PathLike], **kwargs
+) -> Generator[ManifestEntry, None, None]:
+    """
+    Yields all entries of a `manifest` file line by line. Empty lines and comments are
+    skipped.
+
+    A `ValueError` is raised if a line is not a valid manifest entry.
+
+    For `**kwargs` see `Path.read_lines()`.
+
+    >>> next(read_manifest("files.md5"))
+    ManifestEntry(digest='b720c6d9fa5e0473f8d86461dbb43caf', filename='LICENSE',
+    size=None, algorithm=None)
+    """
+    kwargs.setdefault("encoding", "utf-8")
+
+    for number, line in enumerate(Path(manifest).read_lines(**kwargs), start=1):
+        line = line.rstrip("\r\n")
+
+        if not line.strip() or line.startswith("#"):
+            continue
+
+        escaped = line.startswith("\\")
+
+        if escaped:
+            line = line[1:]
+
+        match = _GNU.match(line) or _SIZE.match(line) or _BSD.match(line)
+
+        if match is None:
+            raise ValueError(f"'{manifest}' line {number} is not a checksum: {line}")
+
+        entry = match.groupdict()
+        filename = entry["filename"]
+
+        yield ManifestEntry(
+            digest=entry["digest"].lower(),
+            filename=_unescape(filename) if escaped else filename,
+            size=int(entry["size"]) if entry.get("size") else None,
+            algorithm=entry.get("algorithm"),
+        )
+
+
+def write_manifest(
+    manifest: Union[str, os.PathLike],
+    files: Iterable[Union[str, os.PathLike]],
+    algorithm: str = None,
+    *,
+    size: bool = False,
+    workers: int = None,
+    **kwargs,
+) -> Path:
+    """
+    Writes the hexdigests of all `files` into a `manifest` file and returns its path.
+    Filenames are written relative to the directory of the manifest, the manifest
+    itself is skipped.
+
+    - `algorithm` is guessed from the name of the manifest if it is not given, e.g.
+    `SHA256SUMS` or `files.md5`, otherwise `Path.default_hash` is used.
+    - If `size` is `True` the size of each file is written as well, so
+    `verify_manifest()` can detect truncated files without hashing them. Such
+    manifests can not be checked with `sha256sum --check`.
+    - Files are hashed in a pool of `workers` threads, see `Path.hexdigest_iter()`.
+
+    For `**kwargs` see `Path.hexdigest()`.
+    """
+    manifest = Path(manifest).resolve()
+    root = manifest.parent
+    algorithm = _algorithm(manifest, algorithm)
+
+    def exclude_manifest(file: Union[str, os.PathLike]) -> bool:
+        return Path(file).resolve() != manifest
+
+    with manifest.open("w", encoding="utf-8", newline="\n") as f:
+        for path, digest in Path.hexdigest_iter(
+            filter(exclude_manifest, files),
+            algorithm,
+            workers=workers,
+            ordered=True,
+            **kwargs,
+        ):
+            if isinstance(digest, Exception):
+                raise digest
+
+            filename, prefix = _escape(
+                path.resolve().relative_to(root, walk_up=True).as_posix()
+            )
+
+            if size:
+                f.write(f"{prefix}{digest} {os.stat(path).st_size} *{filename}\n")
+            else:
+                f.write(f"{prefix}{digest} *{filename}\n")
+
+    return manifest
+
+
+def verify_manifest(
+    manifest: Union[str, os.PathLike],
+    algorithm: str = None,
+    *,
+    workers: int = None,
+    ordered: bool = False,
+    **kwargs,
+) -> Generator[Tuple[Path, Union[bool, Exception]], None, None]:
+    """
+    Verifies all files of a `manifest` in a pool of `workers` threads and yields
+    2-tuples of `(path, result)` as soon as a file is verified.
+
+    `result` is `True` if the hexdigest matches, `False` if the file was modified or
+    the exception raised by `Path.verify()`, e.g. `FileNotFoundError` for missing
+    files.
+
+    If the manifest carries the size of a file, it is compared first, so truncated
+    files fail without being hashed.
+
+    For `algorithm` see `write_manifest()`, for `ordered` see `Path.hexdigest_iter()`
+    and for `**kwargs` see `Path.hexdigest()`.
+    """
+    manifest = Path(manifest)
+    root = manifest.parent
+    default = _algorithm(manifest, algorithm)
+
+    def verify(item: Tuple[Path, ManifestEntry]) -> bool:
+        path, entry = item
+
+        if entry.size is not None and os.stat(path).st_size != entry.size:
+            return False
+
+        return path.verify(
+            entry.digest,
+            algorithm or (entry.algorithm or default).lower().replace("-", "_"),
+            **kwargs,
+        )
+
+    entries = ((root.joinpath(e.filename), e) for e in read_manifest(manifest))
+
+    workers = _workers(workers)
+
+    with concurrent.futures.ThreadPoolExecutor(workers) as executor:
+        for (path, _), result in _imap_bounded(
+            executor, verify, entries, workers=workers, ordered=ordered
+        ):
+            yield path, result
+
+
+__all__ = ["ManifestEntry", "read_manifest", "write_manifest", "verify_manifest"]
@@ -0,0 +1,253 @@
+"""
+Progress reporting for long running I/O operations like `Path.hexdigest()`,
+`Path.copy()`, `Path.make_archive()` and `Path.unpack_archive()`.
+
+Pass a callable or a `ProgressReporter` as `progress` keyword-argument, it is called
+with a `Progress` object at most every `interval` seconds or `step` bytes and once
+when the operation is finished.
+
+```python
+from pathlibutil import Path
+from pathlibutil.progress import ProgressReporter
+
+
+def show(progress):
+    print(f"{progress.done:.1mb} / {progress.total:.1mb} mb {progress.mbps:.1f} mb/s")
+
+
+Path("disk.img").hexdigest("sha256", progress=ProgressReporter(show, interval=1))
+```
+"""
+
+import contextlib
+import threading
+import time
+from dataclasses import dataclass
+from typing import Callable, Generator, Optional, Union
+
+from pathlibutil.types import ByteInt
+
+
+@dataclass(frozen=True)
+class Progress:
+    """
+    Snapshot of the progress of an operation.
+    """
+
+    done: ByteInt
+    """
+    Bytes processed so far.
+    """
+    total: Optional[ByteInt]
+    """
+    Total bytes of the operation, `None` if it is unknown.
+    """
+    elapsed: float
+    """
+    Seconds since the operation started.
+    """
+    finished: bool = False
+    """
+    `True` for the last report of an operation.
+    """
+
+    @property
+    def rate(self) -> float:
+        """
+        Throughput in bytes per second.
+        """
+        return self.done / self.elapsed if self.elapsed > 0 else 0.0
+
+    @property
+    def mbps(self) -> float:
+        """
+        Throughput in megabytes per second.
+        """
+        return self.rate / 10**6
+
+    @property
+    def percent(self) -> Optional[float]:
+        """
+        Progress in percent, `None` if the total is unknown.
+
+        >>> Progress(ByteInt(50), ByteInt(200), 1.0).percent
+        25.0
+        """
+        if self.total is None:
+            return None
+
+        return 100.0 * self.done / self.total if self.total else 100.0
+
+
+class ProgressReporter:
+    """
+    Calls `callback` with a `Progress` object, at most every `interval` seconds or
+    every `step` bytes, whichever comes first, and once when finished.
+    """
+
+    def __init__(
+        self,
+        callback: Callable[[Progress], None],
+        *,
+        interval: float = 0.5,
+        step: int = None,
+    ) -> None:
+        self.callback = callback
+        """
+        Callable which receives the `Progress` reports.
+        """
+        self.interval = interval
+        """
+        Minimum seconds between two reports.
+        """
+        self.step = step
+        """
+        Report after this number of bytes even if `interval` has not passed.
+        """
+        self._lock = threading.Lock()
+        self.start()
+
+    @classmethod
+    def from_progress(
+        cls, progress: Union[Callable[[Progress], None], "ProgressReporter", None]
+    ) -> Optional["ProgressReporter"]:
+        """
+        Returns `progress` if it is a `ProgressReporter`, wraps a callable or returns
+        `None`.
+        """
+        if progress is None or isinstance(progress, ProgressReporter):
+            return progress
+
+        return cls(progress)
+
+    def start(self, total: int = None) -> None:
+        """
+        Resets the reporter for a new operation with `total` bytes.
+        """
+        self.total = None if total is None else ByteInt(total)
+        self.done = 0
+        self._start = time.monotonic()
+        self._last_time = self._start
+        self._last_done = 0
+
+    def _snapshot(self, now: float, finished: bool = False) -> Progress:
+        self._last_time = now
+        self._last_done = self.done
+
+        return Progress(ByteInt(self.done), self.total, now - self._start, finished)
+
+    def _advance(self, done: int) -> Optional[Progress]:
+        """
+        Sets the processed bytes and returns a snapshot if a report is due.
+        """
+        self.done = done
+        now = time.monotonic()
+
+        if now - self._last_time >= self.interval or (
+            self.step is not None and done - self._last_done >= self.step
+        ):
+            return self._snapshot(now)
+
+        return None
+
+    def _report(self, progress: Optional[Progress]) -> None:
+        """
+        Calls the callback outside of the lock, so a slow callback does not block
+        other threads and it can use the reporter itself.
+        """
+        if progress is not None:
+            self.callback(progress)
+
+    def update(self, n: int) -> None:
+        """
+        Adds `n` processed bytes and reports the progress if it is due.
+        """
+        with self._lock:
+            progress = self._advance(self.done + n)
+
+        self._report(progress)
+
+    def set(self, done: int) -> None:
+        """
+        Sets the processed bytes to `done` and reports the progress if it is due.
+        """
+        with self._lock:
+            progress = self._advance(done)
+
+        self._report(progress)
+
+    def finish(self) -> None:
+        """
+        Reports the final progress of the operation.
+        """
+        with self._lock:
+            progress = self._snapshot(time.monotonic(), finished=True)
+
+        self._report(progress)
+
+    def shared(self) -> "ProgressReporter":
+        """
+        Returns a reporter for the single files of an operation on many files, it
+        adds their bytes to this reporter. Its `start()` and `finish()` are ignored,
+        so call them once on this reporter for the whole operation.
+
+        It is thread-safe and can be used by all worker threads of a pool.
+        """
+        return _SharedProgressReporter(self)
+
+    @contextlib.contextmanager
+    def monitor(self, measure: Callable[[], int]) -> Generator[None, None, None]:
+        """
+        Contextmanager which calls `measure()` every `interval` seconds in a
+        background thread to report the progress of an operation which can not
+        report its progress itself, e.g. the size of a growing file.
+        """
+        stop = threading.Event()
+
+        def poll() -> None:
+            while not stop.wait(self.interval):
+                try:
+                    self.set(measure())
+                except OSError:
+                    pass
+
+        thread = threading.Thread(target=poll, daemon=True)
+        thread.start()
+
+        try:
+            yield
+        finally:
+            stop.set()
+            thread.join()
+
+            try:
+                self.set(measure())
+            except OSError:
+                pass
+
+            self.finish()
+
+
+class _SharedProgressReporter(ProgressReporter):
+    """
+    Forwards the bytes of a single file to the `ProgressReporter` of the whole
+    operation, see `ProgressReporter.shared()`.
+    """
+
+    def __init__(self, reporter: ProgressReporter) -> None:
+        self.reporter = reporter
+
+    def start(self, total: int = None) -> None:
+        pass
+
+    def update(self, n: int) -> None:
+        self.reporter.update(n)
+
+    def set(self, done: int) -> None:
+        raise TypeError("a shared reporter can only be updated")
+
+    def finish(self) -> None:
+        pass
+
+
+__all__ = ["Progress", "ProgressReporter"]
@@ -2,7 +2,7 @@ import functools
 import os
 import re
 from datetime import datetime, tzinfo
-from typing import Iterable, Set, Tuple, TypeVar
+from typing import Iterable, NamedTuple, Set, Tuple, TypeVar
 
 _ByteInt = TypeVar("_ByteInt", bound="ByteInt")
 _stat_result = TypeVar("_stat_result", bound="os.stat_result")
@@ -352,3 +352,46 @@ class StatResult:
         Return the wrapped `os.stat_result` object.
         """
         return self._obj
+
+
+class SizeEstimate(NamedTuple):
+    """
+    Estimated size of a directory tree with a confidence interval, see
+    `pathlibutil.Path.size_estimate()`.
+
+    >>> print(Path("/mnt/share").size_estimate(timeout=10).size)
+    1.47 pb
+    """
+
+    size: ByteInt
+    """
+    Estimated size in bytes.
+    """
+    low: ByteInt
+    """
+    Lower bound of the confidence interval.
+    """
+    high: ByteInt
+    """
+    Upper bound of the confidence interval.
+    """
+    samples: int
+    """
+    Number of random walks from the root into the tree.
+    """
+    scans: int
+    """
+    Number of directories which were scanned.
+    """
+    exhaustive: bool = False
+    """
+    `True` if every directory of the tree was scanned and no file was sampled.
+    """
+
+    @property
+    def exact(self) -> bool:
+        """
+        `True` if `size` is the exact size, because the whole tree was scanned. An
+        empty confidence interval of identical samples is not exact.
+        """
+        return self.exhaustive
@@ -0,0 +1,592 @@
+"""
+Fast traversal of directory trees on top of `os.scandir()`.
+
+`scantree()` walks a directory tree with an explicit stack and yields an `Entry`
+for every file. An `Entry` keeps the `os.DirEntry` of the listing, so the file type
+and the `stat()` result are cached and the `Path` object is only created if it is
+requested with `Entry.to_path()`.
+
+```python
+from pathlibutil import Path
+
+size = sum(entry.stat().st_size for entry in Path("project").scantree())
+logs = [entry.to_path() for entry in Path("logs").scantree() if entry.depth == 0]
+```
+
+`scantree_parallel()` keeps several directory listings in flight in a thread pool,
+which hides the latency of network filesystems like NFS or SMB, where each
+`os.scandir()` is a round trip to the server.
+
+```python
+files = Path("//filer/share").iterdir(recursive=True, workers=32)
+```
+
+`ascantree()` and `awalk()` are async generators for `asyncio`, which list the next
+directories in the default executor of the event loop while the caller awaits other
+I/O, see `Path.aiterdir()` and `Path.awalk()`.
+
+```python
+async for file in Path("//filer/share").aiterdir(recursive=True):
+    await upload(file)
+```
+"""
+
+import asyncio
+import concurrent.futures
+import functools
+import os
+from typing import (
+    Any,
+    AsyncGenerator,
+    Callable,
+    Generator,
+    List,
+    Optional,
+    Set,
+    Tuple,
+    Type,
+)
+
+import pathlibutil
+from pathlibutil.filters import Filter
+
+
+class Entry:
+    """
+    File of a directory tree yielded by `scantree()`.
+    """
+
+    __slots__ = ("_entry", "_cls", "_path", "depth")
+
+    def __init__(
+        self,
+        entry: os.DirEntry,
+        depth: int,
+        cls: Type["pathlibutil.Path"] = None,
+    ) -> None:
+        self._entry = entry
+        self._cls = cls or pathlibutil.Path
+        self._path = None
+        self.depth = depth
+        """
+        Directory depth of the entry, `0` for entries of the top directory.
+        """
+
+    def __repr__(self) -> str:
+        return f"<{self.__class__.__name__} {self.path!r}>"
+
+    def __fspath__(self) -> str:
+        return self._entry.path
+
+    @property
+    def name(self) -> str:
+        """
+        Filename of the entry.
+        """
+        return self._entry.name
+
+    @property
+    def path(self) -> str:
+        """
+        Path of the entry as `str` joined from the top directory.
+        """
+        return self._entry.path
+
+    def is_dir(self, *, follow_symlinks: bool = True) -> bool:
+        """
+        Cached `os.DirEntry.is_dir()`.
+        """
+        return self._entry.is_dir(follow_symlinks=follow_symlinks)
+
+    def is_file(self, *, follow_symlinks: bool = True) -> bool:
+        """
+        Cached `os.DirEntry.is_file()`.
+        """
+        return self._entry.is_file(follow_symlinks=follow_symlinks)
+
+    def is_symlink(self) -> bool:
+        """
+        Cached `os.DirEntry.is_symlink()`.
+        """
+        return self._entry.is_symlink()
+
+    def inode(self) -> int:
+        """
+        Cached `os.DirEntry.inode()`.
+        """
+        return self._entry.inode()
+
+    def stat(self, *, follow_symlinks: bool = True) -> os.stat_result:
+        """
+        Cached `os.DirEntry.stat()`, only the first call makes a system call.
+        """
+        return self._entry.stat(follow_symlinks=follow_symlinks)
+
+    def to_path(self) -> "pathlibutil.Path":
+        """
+        Returns the entry as `Path` object, it is created on the first call.
+        """
+        if self._path is None:
+            self._path = self._cls(self._entry.path)
+
+        return self._path
+
+
+_Frame = Tuple[str, int, str, Optional[Filter]]
+"""
+Directory to scan as `(path, depth, relpath, filters)`, `filters` are the ones of its
+parent directory.
+"""
+
+
+def _listdir(
+    frame: _Frame,
+    *,
+    max_depth: Optional[int] = None,
+    follow_symlinks: bool = False,
+    cls: Type["pathlibutil.Path"] = None,
+) -> Tuple[List[Entry], List[os.DirEntry], Optional[Filter]]:
+    """
+    Scans a directory and returns its files as `Entry` objects, the subdirectories to
+    enter and the filters of the directory.
+    """
+    path, depth, relpath, filters = frame
+    files, dirs = [], []
+
+    if filters is not None:
+        filters = filters.for_directory(path, relpath)
+
+    with os.scandir(path) as entries:
+        for entry in entries:
+            try:
+                is_dir = entry.is_dir()
+            except OSError:
+                is_dir = False
+
+            if not is_dir:
+                if filters is None or filters.accept_file(relpath + entry.name):
+                    files.append(Entry(entry, depth, cls))
+            elif max_depth is not None and depth >= max_depth:
+                continue
+            elif filters is not None and not filters.accept_dir(relpath + entry.name):
+                continue
+            elif follow_symlinks or not entry.is_symlink():
+                dirs.append(entry)
+
+    return files, dirs, filters
+
+
+def _subdirs(
+    frame: _Frame,
+    dirs: List[os.DirEntry],
+    filters: Optional[Filter],
+    exclude_dirs: Callable[[Entry], bool] = None,
+    cls: Type["pathlibutil.Path"] = None,
+) -> List[_Frame]:
+    """
+    Returns the frames of the subdirectories of a scanned directory in walk order.
+    """
+    _, depth, relpath, _ = frame
+
+    if exclude_dirs:
+        dirs = [d for d in dirs if not exclude_dirs(Entry(d, depth, cls))]
+
+    return [(d.path, depth + 1, f"{relpath}{d.name}/", filters) for d in dirs]
+
+
+def scantree(
+    top: "os.PathLike[str]",
+    *,
+    max_depth: Optional[int] = None,
+    exclude_dirs: Callable[[Entry], bool] = None,
+    filters: Filter = None,
+    follow_symlinks: bool = False,
+    on_error: Callable[[OSError], object] = None,
+    cls: Type["pathlibutil.Path"] = None,
+) -> Generator[Entry, None, None]:
+    """
+    Walks the directory tree of `top` top-down and yields an `Entry` for each file,
+    in the same order as `os.walk()`.
+
+    - `max_depth` subdirectories are only entered up to this directory depth, `0`
+      yields the files of `top` only
+    - `exclude_dirs` callable which gets the `Entry` of a subdirectory and returns
+      `True` to skip it
+    - `filters` a `pathlibutil.filters.GlobFilter` or `pathlibutil.filters.GitIgnore`
+      to prune subdirectories and skip files by their relative path
+    - `follow_symlinks` enters symlinks to directories, they are never yielded
+    - `on_error` callable which gets the `OSError` if a directory can not be
+      listed, by default it is ignored
+    - `cls` of the `Path` objects created by `Entry.to_path()`
+
+    >>> [entry.name for entry in scantree("project", max_depth=0)]
+    ['README.md', 'pyproject.toml']
+    """
+    stack = [(os.fspath(top), 0, "", filters)]
+
+    while stack:
+        frame = stack.pop()
+
+        try:
+            files, dirs, filters = _listdir(
+                frame, max_depth=max_depth, follow_symlinks=follow_symlinks, cls=cls
+            )
+        except OSError as e:
+            if on_error is not None:
+                on_error(e)
+            continue
+
+        yield from files
+
+        stack.extend(reversed(_subdirs(frame, dirs, filters, exclude_dirs, cls)))
+
+
+def scantree_parallel(
+    top: "os.PathLike[str]",
+    *,
+    workers: int = 8,
+    ordered: bool = False,
+    pending: int = None,
+    max_depth: Optional[int] = None,
+    exclude_dirs: Callable[[Entry], bool] = None,
+    filters: Filter = None,
+    follow_symlinks: bool = False,
+    on_error: Callable[[OSError], object] = None,
+    cls: Type["pathlibutil.Path"] = None,
+) -> Generator[Entry, None, None]:
+    """
+    Walks the directory tree of `top` like `scantree()`, but directories are listed
+    by `workers` threads of a `concurrent.futures.ThreadPoolExecutor`.
+
+    - `ordered` yields the entries in the same order as `scantree()`, directories are
+      still listed ahead, but their files are yielded in walk order, otherwise
+      directories are yielded as soon as they are listed
+    - `pending` directory listings are in flight at most, default is twice the number
+      of `workers`
+    - for all other arguments see `scantree()`, `exclude_dirs` and `on_error` are
+      called from the thread of the caller
+
+    Listings which are not started yet are cancelled when the generator is closed.
+
+    >>> len(list(scantree_parallel("//filer/share", workers=32)))
+    5123456
+    """
+    if pending is None:
+        pending = 2 * workers
+
+    if pending < 1:
+        raise ValueError(f"pending must be a positive integer, got '{pending}'")
+
+    listdir = functools.partial(
+        _listdir, max_depth=max_depth, follow_symlinks=follow_symlinks, cls=cls
+    )
+    walk = _walk_ordered if ordered else _walk_unordered
+
+    with concurrent.futures.ThreadPoolExecutor(workers) as executor:
+        yield from walk(
+            executor,
+            listdir,
+            (os.fspath(top), 0, "", filters),
+            pending=pending,
+            exclude_dirs=exclude_dirs,
+            on_error=on_error,
+            cls=cls,
+        )
+
+
+def _walk_unordered(
+    executor: concurrent.futures.Executor,
+    listdir: Callable[[_Frame], tuple],
+    top: _Frame,
+    *,
+    pending: int,
+    exclude_dirs: Callable[[Entry], bool] = None,
+    on_error: Callable[[OSError], object] = None,
+    cls: Type["pathlibutil.Path"] = None,
+) -> Generator[Entry, None, None]:
+    """
+    Yields the files of the directories in the order their listings finish.
+    """
+    queue = [top]
+    futures = {}
+
+    def submit() -> None:
+        while queue and len(futures) < pending:
+            frame = queue.pop()
+            futures[executor.submit(listdir, frame)] = frame
+
+    try:
+        submit()
+
+        while futures:
+            done, _ = concurrent.futures.wait(
+                futures, return_when=concurrent.futures.FIRST_COMPLETED
+            )
+
+            for future in done:
+                frame = futures.pop(future)
+
+                try:
+                    files, dirs, filters = future.result()
+                except OSError as e:
+                    if on_error is not None:
+                        on_error(e)
+                    continue
+
+                subdirs = _subdirs(frame, dirs, filters, exclude_dirs, cls)
+                queue.extend(reversed(subdirs))
+                submit()
+
+                yield from files
+    finally:
+        for future in futures:
+            future.cancel()
+
+
+def _walk_ordered(
+    executor: concurrent.futures.Executor,
+    listdir: Callable[[_Frame], tuple],
+    top: _Frame,
+    *,
+    pending: int,
+    exclude_dirs: Callable[[Entry], bool] = None,
+    on_error: Callable[[OSError], object] = None,
+    cls: Type["pathlibutil.Path"] = None,
+) -> Generator[Entry, None, None]:
+    """
+    Yields the files of the directories in walk order, the next directories on the
+    stack are listed ahead.
+    """
+    stack = [[None, top]]
+    running = 0
+
+    try:
+        while stack:
+            for item in reversed(stack[-pending:]):
+                if running >= pending:
+                    break
+
+                if item[0] is None:
+                    item[0] = executor.submit(listdir, item[1])
+                    running += 1
+
+            future, frame = stack.pop()
+
+            try:
+                if future is None:
+                    files, dirs, filters = listdir(frame)
+                else:
+                    running -= 1
+                    files, dirs, filters = future.result()
+            except OSError as e:
+                if on_error is not None:
+                    on_error(e)
+                continue
+
+            yield from files
+
+            subdirs = _subdirs(frame, dirs, filters, exclude_dirs, cls)
+            stack.extend([None, subdir] for subdir in reversed(subdirs))
+    finally:
+        for future, _ in stack:
+            if future is not None:
+                future.cancel()
+
+
+async def _aprefetch(
+    top: _Frame,
+    listdir: Callable[[_Frame], Any],
+    subdirs: Callable[[_Frame, Any], List[_Frame]],
+    *,
+    pending: int = 8,
+    top_down: bool = True,
+    on_error: Callable[[OSError], object] = None,
+) -> AsyncGenerator[Tuple[_Frame, Any], None]:
+    """
+    Walks a directory tree and yields 2-tuples of `(frame, listdir(frame))`.
+
+    The next `pending` directories on the stack are listed ahead in the default
+    executor. `subdirs` is called after the caller resumed, so it can prune the
+    result top-down. Listings which are not started yet are cancelled when the
+    generator is closed, callers have to `aclose()` it explicitly.
+    """
+    if pending < 1:
+        raise ValueError(f"pending must be a positive integer, got '{pending}'")
+
+    loop = asyncio.get_running_loop()
+    stack = [[None, top, None]]
+    running = 0
+
+    def submit(frame: _Frame) -> asyncio.Future:
+        nonlocal running
+        running += 1
+
+        return loop.run_in_executor(None, listdir, frame)
+
+    try:
+        while stack:
+            for item in reversed(stack[-pending:]):
+                if running >= pending:
+                    break
+
+                if item[0] is None and item[2] is None:
+                    item[0] = submit(item[1])
+
+            future, frame, result = stack.pop()
+
+            if result is None:
+                try:
+                    result = await (future or submit(frame))
+                except OSError as e:
+                    if on_error is not None:
+                        on_error(e)
+                    continue
+                finally:
+                    running -= 1
+
+                if not top_down:
+                    stack.append([None, frame, result])
+                    stack.extend(
+                        [None, d, None] for d in reversed(subdirs(frame, result))
+                    )
+                    continue
+
+                yield frame, result
+
+                stack.extend([None, d, None] for d in reversed(subdirs(frame, result)))
+            else:
+                yield frame, result
+    finally:
+        cancelled = [f.cancel() for f, *_ in stack if f is not None]
+
+        if cancelled:
+            # the executor futures are cancelled by callbacks of the event loop
+            await asyncio.sleep(0)
+
+
+async def ascantree(
+    top: "os.PathLike[str]",
+    *,
+    pending: int = 8,
+    max_depth: Optional[int] = None,
+    exclude_dirs: Callable[[Entry], bool] = None,
+    filters: Filter = None,
+    follow_symlinks: bool = False,
+    on_error: Callable[[OSError], object] = None,
+    cls: Type["pathlibutil.Path"] = None,
+) -> AsyncGenerator[Entry, None]:
+    """
+    Async generator of `scantree()`, which yields the entries in the same order.
+
+    Directory listings run in the default executor of the event loop and at most
+    `pending` of them are listed ahead, so a slow consumer does not fill the memory.
+    For all other arguments see `scantree()`.
+
+    >>> async for entry in ascantree("//filer/share"):
+    ...     await upload(entry.path)
+    """
+    listdir = functools.partial(
+        _listdir, max_depth=max_depth, follow_symlinks=follow_symlinks, cls=cls
+    )
+
+    def subdirs(frame: _Frame, result: tuple) -> List[_Frame]:
+        _, dirs, filters = result
+
+        return _subdirs(frame, dirs, filters, exclude_dirs, cls)
+
+    listings = _aprefetch(
+        (os.fspath(top), 0, "", filters),
+        listdir,
+        subdirs,
+        pending=pending,
+        on_error=on_error,
+    )
+
+    try:
+        async for _, (files, *_) in listings:
+            for entry in files:
+                yield entry
+    finally:
+        await listings.aclose()
+
+
+def _walkdir(
+    frame: _Frame,
+) -> Tuple[List[str], List[str], Optional[Filter], Set[str]]:
+    """
+    Lists a directory like `os.walk()` and returns the names of its subdirectories,
+    its files, its filters and the names of subdirectories which are symlinks.
+    """
+    path, _, relpath, filters = frame
+    dirnames, filenames, links = [], [], set()
+
+    if filters is not None:
+        filters = filters.for_directory(path, relpath)
+
+    with os.scandir(path) as entries:
+        for entry in entries:
+            try:
+                is_dir = entry.is_dir()
+            except OSError:
+                is_dir = False
+
+            if not is_dir:
+                if filters is None or filters.accept_file(relpath + entry.name):
+                    filenames.append(entry.name)
+            elif filters is None or filters.accept_dir(relpath + entry.name):
+                dirnames.append(entry.name)
+
+                if entry.is_symlink():
+                    links.add(entry.name)
+
+    return dirnames, filenames, filters, links
+
+
+async def awalk(
+    top: "os.PathLike[str]",
+    top_down: bool = True,
+    on_error: Callable[[OSError], object] = None,
+    follow_symlinks: bool = False,
+    *,
+    pending: int = 8,
+    filters: Filter = None,
+) -> AsyncGenerator[Tuple[str, List[str], List[str]], None]:
+    """
+    Async generator of `os.walk()`, which yields 3-tuples of
+    `(dirpath, dirnames, filenames)` in the same order.
+
+    If `top_down` is `True` `dirnames` can be modified in place to prune the walk,
+    directory listings run in the default executor of the event loop and at most
+    `pending` of them are listed ahead. `filters` see `scantree()`.
+
+    >>> async for dirpath, dirnames, filenames in awalk("//filer/share"):
+    ...     dirnames[:] = [d for d in dirnames if not d.startswith(".")]
+    """
+
+    def subdirs(frame: _Frame, result: tuple) -> List[_Frame]:
+        path, depth, relpath, _ = frame
+        dirnames, _, filters, links = result
+
+        return [
+            (os.path.join(path, name), depth + 1, f"{relpath}{name}/", filters)
+            for name in dirnames
+            if follow_symlinks or name not in links
+        ]
+
+    listings = _aprefetch(
+        (os.fspath(top), 0, "", filters),
+        _walkdir,
+        subdirs,
+        pending=pending,
+        top_down=top_down,
+        on_error=on_error,
+    )
+
+    try:
+        async for (path, *_), (dirnames, filenames, *_) in listings:
+            yield path, dirnames, filenames
+    finally:
+        await listings.aclose()
+
+
+__all__ = ["Entry", "scantree", "scantree_parallel", "ascantree", "awalk"]
@@ -13,8 +13,12 @@ def cls() -> Generator[Path, Any, Any]:
     """return the same class for all test function"""
 
     hash = Path.default_hash
+    chunk_size = Path.default_chunk_size
+    cache = Path.digest_cache
     yield Path
     Path.default_hash = hash
+    Path.default_chunk_size = chunk_size
+    Path.digest_cache = cache
 
     try:
         del Path._netuse
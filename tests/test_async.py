@@ -0,0 +1,160 @@
+import asyncio
+import hashlib
+import pathlib
+
+import pytest
+
+from pathlibutil import Path
+from pathlibutil.cache import DigestCache
+
+
+@pytest.fixture
+def data_file(tmp_path: pathlib.Path) -> Path:
+    file = Path(tmp_path, "data.bin")
+    file.write_bytes(bytes(range(256)) * 100)
+
+    yield file
+
+
+def test_ahexdigest(data_file: Path):
+    digest = asyncio.run(data_file.ahexdigest("sha256", chunk_size=1000))
+
+    assert digest == hashlib.sha256(data_file.read_bytes()).hexdigest()
+
+
+@pytest.mark.parametrize(
+    "kwargs",
+    [
+        {"length": 8},
+        {"fingerprint": 100},
+        {"chunk_size": 7},
+    ],
+)
+def test_ahexdigest_kwargs(data_file: Path, kwargs):
+    algorithm = "shake_128" if "length" in kwargs else "md5"
+
+    digest = asyncio.run(data_file.ahexdigest(algorithm, **kwargs))
+
+    assert digest == data_file.hexdigest(algorithm, **kwargs)
+
+
+def test_ahexdigest_recursive(data_file: Path):
+    digest = asyncio.run(Path(data_file.parent).ahexdigest(recursive=True))
+
+    assert digest == Path(data_file.parent).hexdigest(recursive=True)
+
+
+def test_ahexdigest_raises(data_file: Path):
+    with pytest.raises(FileNotFoundError):
+        asyncio.run(Path(data_file.parent).ahexdigest())
+
+    with pytest.raises(ValueError):
+        asyncio.run(data_file.ahexdigest(chunk_size=-1))
+
+    with pytest.raises(TypeError):
+        asyncio.run(data_file.ahexdigest("shake_256"))
+
+
+def test_ahexdigest_cache(data_file: Path, cls: Path, mocker):
+    cls.digest_cache = DigestCache()
+
+    digest = asyncio.run(data_file.ahexdigest())
+
+    spy = mocker.spy(data_file.__class__, "open")
+
+    assert asyncio.run(data_file.ahexdigest()) == digest
+    assert spy.call_count == 0
+    assert len(cls.digest_cache) == 1
+
+
+def test_averify(data_file: Path):
+    digest = hashlib.md5(data_file.read_bytes()).hexdigest()
+
+    assert asyncio.run(data_file.averify(digest)) is True
+    assert asyncio.run(data_file.averify(digest[:8].upper(), strict=False)) is True
+    assert asyncio.run(data_file.averify(digest.upper())) is False
+
+
+def test_ahexdigest_concurrency(tmp_path: pathlib.Path, monkeypatch):
+    monkeypatch.setattr(Path, "async_concurrency", 2)
+
+    files = []
+
+    for i in range(6):
+        file = Path(tmp_path, f"file{i}.bin")
+        file.write_bytes(bytes(i) * 10000)
+        files.append(file)
+
+    opened = []
+    original = Path.open
+
+    def counter(self, *args, **kwargs):
+        opened.append(ReadCounter(original(self, *args, **kwargs)))
+        concurrent = sum(not f.closed for f in opened)
+        counter.max = max(getattr(counter, "max", 0), concurrent)
+        return opened[-1]
+
+    monkeypatch.setattr(Path, "open", counter)
+
+    async def main():
+        return await asyncio.gather(*(f.ahexdigest(chunk_size=100) for f in files))
+
+    digests = asyncio.run(main())
+
+    monkeypatch.undo()
+
+    assert digests == [f.hexdigest() for f in files]
+    assert counter.max <= 2
+
+
+class ReadCounter:
+    """file wrapper to count bytes read with `readinto()`"""
+
+    def __init__(self, f):
+        self.f = f
+        self.read = 0
+
+    def readinto(self, buffer):
+        n = self.f.readinto(buffer)
+        self.read += n
+        return n
+
+    def close(self):
+        self.f.close()
+
+    @property
+    def closed(self):
+        return self.f.closed
+
+
+def test_ahexdigest_cancel(data_file: Path, mocker):
+    opened = []
+    original = Path.open
+
+    def counter(self, *args, **kwargs):
+        opened.append(ReadCounter(original(self, *args, **kwargs)))
+        return opened[-1]
+
+    mocker.patch.object(Path, "open", counter)
+
+    async def main():
+        task = asyncio.create_task(data_file.ahexdigest(chunk_size=1))
+
+        while not opened or not opened[0].read:
+            await asyncio.sleep(0)
+
+        task.cancel()
+
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+        for _ in range(100):
+            if opened[0].closed:
+                break
+
+            await asyncio.sleep(0.01)
+
+    asyncio.run(main())
+
+    assert opened[0].closed
+    assert opened[0].read < data_file.size()
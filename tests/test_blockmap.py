@@ -0,0 +1,88 @@
+import pathlib
+
+import pytest
+
+from pathlibutil import Path
+from pathlibutil.blockmap import BlockMap
+
+
+@pytest.fixture
+def image(tmp_path: pathlib.Path) -> Path:
+    file = Path(tmp_path, "disk.img")
+    file.write_bytes(b"\x11" * (10 * 1024 + 100))
+
+    yield file
+
+
+def patch(file: Path, offset: int, data: bytes) -> None:
+    with file.open("r+b") as f:
+        f.seek(offset)
+        f.write(data)
+
+
+def test_blockmap(image: Path):
+    blockmap = BlockMap.from_file(image, "blake2b", block_size=1024)
+
+    assert blockmap.size == image.size()
+    assert len(blockmap.digests) == 11
+    assert blockmap.root == image.hexdigest_blocks("blake2b", block_size=1024)[0]
+    assert blockmap.verify(image) is True
+    assert "blocks=11" in repr(blockmap)
+
+
+def test_blockmap_sidecar(image: Path):
+    blockmap = BlockMap.from_file(image, "sha256", block_size=1024)
+
+    sidecar = blockmap.save(image.with_suffix(".blockmap"))
+
+    assert sidecar.size() == 6 + len("sha256") + 18 + 11 * 32
+    assert BlockMap.load(sidecar) == blockmap
+    assert blockmap != "blockmap"
+
+
+def test_blockmap_empty(tmp_path: pathlib.Path):
+    file = Path(tmp_path, "empty.img")
+    file.touch()
+
+    blockmap = BlockMap.from_file(file)
+
+    assert BlockMap.from_bytes(blockmap.to_bytes()) == blockmap
+    assert blockmap.verify(file) is True
+
+
+def test_blockmap_changes(image: Path):
+    blockmap = BlockMap.from_file(image, block_size=1024)
+
+    patch(image, 10, b"\x00\xff")
+    patch(image, 3000, b"\x00\xff" * 1024)
+    patch(image, 10 * 1024 + 99, b"\x00\xff")
+
+    assert blockmap.changes(image, workers=2) == [
+        (0, 1024),
+        (2048, 5120),
+        (10240, 10 * 1024 + 101),
+    ]
+    assert blockmap.verify(image) is False
+
+
+def test_blockmap_truncated(image: Path):
+    blockmap = BlockMap.from_file(image, block_size=1024)
+
+    with image.open("r+b") as f:
+        f.truncate(5000)
+
+    assert blockmap.changes(image) == [(4096, 10 * 1024 + 100)]
+
+
+@pytest.mark.parametrize(
+    "data",
+    [
+        b"",
+        b"XXXX\x01\x03md5",
+        b"PLBM\x01\x03md5\x10\x00",
+        BlockMap("md5", 1024, 10, [b"\x00" * 16]).to_bytes()[:-1],
+    ],
+)
+def test_blockmap_raises(data: bytes):
+    with pytest.raises(ValueError):
+        BlockMap.from_bytes(data)
@@ -0,0 +1,118 @@
+import hashlib
+import os
+import pathlib
+
+import pytest
+
+from pathlibutil import Path
+from pathlibutil.cache import DigestCache
+
+
+@pytest.fixture
+def cache(cls: Path):
+    with DigestCache() as cache:
+        cls.digest_cache = cache
+        yield cache
+
+
+@pytest.fixture
+def data_file(tmp_path: pathlib.Path) -> Path:
+    file = Path(tmp_path, "data.bin")
+    file.write_bytes(b"ipsum lorem" * 100)
+
+    return file
+
+
+def test_cache_get_set(tmp_path: pathlib.Path, data_file: Path):
+    cache = DigestCache(tmp_path / "cache.sqlite")
+    stat = os.stat(data_file)
+
+    assert cache.get(stat, "md5") is None
+
+    cache.set(stat, "md5", "digest", data_file)
+    cache.set(stat, "md5", "digest", data_file)
+
+    assert cache.get(stat, "md5") == "digest"
+    assert cache.get(stat, "sha1") is None
+    assert len(cache) == 1
+
+    cache.close()
+
+    with DigestCache(tmp_path / "cache.sqlite") as cache:
+        assert cache.get(stat, "md5") == "digest"
+        assert len(cache) == 1
+
+
+def test_cache_hexdigest(cache: DigestCache, data_file: Path, mocker):
+    digest = hashlib.sha256(data_file.read_bytes()).hexdigest()
+
+    assert data_file.hexdigest("sha256") == digest
+    assert len(cache) == 1
+
+    spy = mocker.spy(Path, "_read_chunks")
+
+    assert data_file.hexdigest("sha256") == digest
+    assert data_file.verify(digest, "sha256") is True
+    assert spy.call_count == 0
+
+    assert data_file.hexdigests(["sha256", "md5"]) == {
+        "sha256": digest,
+        "md5": hashlib.md5(data_file.read_bytes()).hexdigest(),
+    }
+    assert spy.call_count == 1
+    assert len(cache) == 2
+
+
+def test_cache_modified(cache: DigestCache, data_file: Path):
+    _ = data_file.hexdigest()
+
+    data_file.write_bytes(b"lorem ipsum")
+    os.utime(data_file, ns=(0, 0))
+
+    assert data_file.hexdigest() == hashlib.md5(b"lorem ipsum").hexdigest()
+    assert len(cache) == 1
+
+
+def test_cache_length(cache: DigestCache, data_file: Path):
+    a = data_file.hexdigest("shake_128", length=4)
+    b = data_file.hexdigest("shake_128", length=8)
+
+    assert len(a) == 8
+    assert len(b) == 16
+    assert len(cache) == 2
+
+
+def test_cache_max_entries(tmp_path: pathlib.Path, cls: Path):
+    cls.digest_cache = DigestCache(max_entries=3)
+
+    files = [Path(tmp_path, f"file{i}.txt") for i in range(5)]
+
+    for i, file in enumerate(files):
+        file.write_text(str(i))
+        _ = file.hexdigest()
+
+    assert len(cls.digest_cache) == 3
+    assert cls.digest_cache.get(os.stat(files[0]), "md5") is None
+    assert cls.digest_cache.get(os.stat(files[-1]), "md5") is not None
+
+
+def test_cache_invalidate(cache: DigestCache, tmp_path: pathlib.Path):
+    for name in ["a.txt", "sub/b.txt", "sub/c.txt", "subdir/d.txt"]:
+        file = Path(tmp_path, name)
+        file.parent.mkdir(exist_ok=True)
+        file.write_text(name)
+        _ = file.hexdigests(["md5", "sha1"])
+
+    assert len(cache) == 8
+
+    assert cache.invalidate(tmp_path / "a.txt", algorithm="sha1") == 1
+    assert cache.invalidate(tmp_path / "sub") == 4
+    assert len(cache) == 3
+
+    cache.clear()
+    assert len(cache) == 0
+
+
+def test_cache_raises():
+    with pytest.raises(ValueError):
+        DigestCache(max_entries=0)
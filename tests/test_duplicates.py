@@ -0,0 +1,96 @@
+import os
+import pathlib
+
+import pytest
+
+from pathlibutil import Path
+from pathlibutil.duplicates import DuplicateStats, find_duplicates
+
+
+@pytest.fixture
+def tree(tmp_path: pathlib.Path) -> pathlib.Path:
+    large = bytes(range(256)) * 64
+
+    files = {
+        "a/small1.txt": b"small",
+        "b/small2.txt": b"small",
+        "a/other.txt": b"other",
+        "a/unique.txt": b"unique size",
+        "a/large1.bin": large,
+        "b/c/large2.bin": large,
+        "b/large3.bin": large[:-1] + b"\x00",
+        "a/empty1.txt": b"",
+        "b/empty2.txt": b"",
+    }
+
+    for name, content in files.items():
+        file = tmp_path.joinpath(name)
+        file.parent.mkdir(parents=True, exist_ok=True)
+        file.write_bytes(content)
+
+    yield tmp_path
+
+
+def test_find_duplicates(tree: pathlib.Path):
+    groups = sorted(find_duplicates(tree, sample=16))
+
+    assert all(isinstance(p, Path) for group in groups for p in group)
+    assert groups == [
+        [Path(tree, "a/large1.bin"), Path(tree, "b/c/large2.bin")],
+        [Path(tree, "a/small1.txt"), Path(tree, "b/small2.txt")],
+    ]
+
+
+def test_find_duplicates_roots(tree: pathlib.Path):
+    groups = list(find_duplicates([tree / "a", tree / "b", tree / "a"]))
+
+    assert len(groups) == 2
+
+
+def test_find_duplicates_min_size(tree: pathlib.Path):
+    groups = list(find_duplicates(str(tree), min_size=0))
+
+    assert [Path(tree, "a/empty1.txt"), Path(tree, "b/empty2.txt")] in groups
+
+
+def test_find_duplicates_hardlinks(tree: pathlib.Path):
+    try:
+        os.link(tree / "a/unique.txt", tree / "b/link.txt")
+    except OSError:
+        pytest.skip("hardlinks are not supported")
+
+    groups = list(find_duplicates(tree))
+
+    assert len(groups) == 2
+
+
+def test_find_duplicates_stats(tree: pathlib.Path):
+    stats = DuplicateStats()
+
+    _ = list(find_duplicates(tree, "sha1", sample=16, stats=stats, workers=1))
+
+    large = 256 * 64
+
+    assert stats.files == 9
+    assert stats.total == 2 * 5 + 5 + 11 + 3 * large
+    assert stats.size_saved == 11
+    assert stats.fingerprint_read == 3 * 5 + 3 * 3 * 16
+    assert stats.content_read == 2 * large
+    assert stats.fingerprint_saved == large - 3 * 16
+    assert stats.duplicates == 2
+    assert stats.wasted == 5 + large
+    assert stats.saved == stats.total - stats.fingerprint_read - stats.content_read
+
+
+def test_find_duplicates_content(tree: pathlib.Path):
+    large = bytearray(Path(tree, "a/large1.bin").read_bytes())
+    large[1000] = 0
+    Path(tree, "b/large3.bin").write_bytes(large)
+
+    stats = DuplicateStats()
+
+    groups = list(find_duplicates(tree, sample=16, stats=stats))
+
+    assert len(groups) == 2
+    assert stats.fingerprint_saved == 0
+    assert stats.content_read == 3 * 256 * 64
@@ -0,0 +1,293 @@
+import os
+import pathlib
+import sys
+import tarfile
+import zipfile
+
+import pytest
+
+from pathlibutil import Path
+from pathlibutil.filters import GitIgnore, GlobFilter
+
+
+@pytest.fixture
+def tree(tmp_path: pathlib.Path) -> Path:
+    files = {
+        "main.py": 10,
+        "README.md": 20,
+        "debug.log": 40,
+        ".git/config": 80,
+        "src/app.py": 100,
+        "src/app.log": 200,
+        "src/build/out.py": 400,
+        "node_modules/pkg/index.js": 800,
+        "docs/build/index.md": 1600,
+    }
+
+    for name, size in files.items():
+        file = tmp_path.joinpath(name)
+        file.parent.mkdir(parents=True, exist_ok=True)
+        file.write_bytes(b"x" * size)
+
+    yield Path(tmp_path)
+
+
+def relpaths(root: Path, files) -> set:
+    return {Path(f).relative_to(root).as_posix() for f in files}
+
+
+@pytest.mark.parametrize(
+    "pattern, path, result",
+    [
+        ("*.py", "main.py", True),
+        ("*.py", "src/deep/main.py", True),
+        ("/main.py", "src/main.py", False),
+        ("src/*.py", "src/app.py", True),
+        ("src/*.py", "src/build/out.py", False),
+        ("src/**/*.py", "src/build/out.py", True),
+        ("src/**/*.py", "src/app.py", True),
+        ("**/*.log", "src/app.log", True),
+        ("src/**", "src/build/out.py", True),
+        ("?.py", "ab.py", False),
+        ("[ab].py", "b.py", True),
+        ("[!ab].py", "b.py", False),
+        ("a+b(1).txt", "a+b(1).txt", True),
+    ],
+)
+def test_glob_filter(pattern: str, path: str, result: bool):
+    assert GlobFilter(include=pattern).accept_file(path) is result
+    assert GlobFilter(exclude=pattern).accept_file(path) is not result
+
+
+def test_glob_filter_dirs():
+    f = GlobFilter(exclude=[".git/", "build"])
+
+    assert f.accept_dir("src/.git") is False
+    assert f.accept_file(".git") is True
+    assert f.accept_dir("build") is False
+    assert f.accept_file("src/build") is False
+    assert f.accept_dir("src") is True
+
+
+def test_glob_filter_compiled_once():
+    f = GlobFilter(include=["*.py", "*.md"], exclude=["a/", "b/", "*.log"])
+
+    assert f._include.pattern.count("|") == 1
+    assert f._exclude_dirs.pattern.count("|") == 2
+
+
+@pytest.mark.parametrize("include, exclude", [(None, None), ([], "")])
+def test_glob_filter_from_patterns(include, exclude):
+    assert GlobFilter.from_patterns(include, exclude) is None
+
+
+@pytest.mark.parametrize(
+    "include, exclude", [("src/", None), (None, "/"), (None, [""])]
+)
+def test_glob_filter_raises(include, exclude):
+    with pytest.raises(ValueError):
+        GlobFilter(include, exclude)
+
+
+def test_iterdir_filters(tree: Path):
+    files = tree.iterdir(
+        recursive=True,
+        include=["*.py", "*.md"],
+        exclude=[".git/", "node_modules/", "build/"],
+    )
+
+    assert relpaths(tree, files) == {"main.py", "README.md", "src/app.py"}
+
+
+def test_iterdir_filters_prune(tree: Path, mocker):
+    spy = mocker.spy(os, "scandir")
+
+    list(tree.iterdir(recursive=True, exclude=["node_modules/", ".git/"]))
+
+    scanned = {os.path.basename(c.args[0]) for c in spy.call_args_list}
+
+    assert "node_modules" not in scanned
+    assert "pkg" not in scanned
+    assert ".git" not in scanned
+
+
+def test_iterdir_filters_not_recursive(tree: Path):
+    files = tree.iterdir(include="*.md", exclude="docs")
+
+    assert relpaths(tree, files) == {"README.md", ".git", "src", "node_modules"}
+
+
+def test_walk_filters(tree: Path):
+    files = [
+        root.joinpath(f)
+        for root, _, filenames in tree.walk(include="*.log", exclude="src/")
+        for f in filenames
+    ]
+
+    assert relpaths(tree, files) == {"debug.log"}
+
+
+def test_walk_filters_bottom_up(tree: Path):
+    roots = relpaths(tree, (r for r, *_ in tree.walk(False, exclude="build/")))
+
+    assert roots == {".", ".git", "src", "node_modules", "node_modules/pkg", "docs"}
+
+
+def test_size_filters(tree: Path):
+    assert tree.size(include="*.py") == 510
+    assert tree.size(exclude=["build/", "node_modules/", ".git/"]) == 370
+    assert list(tree.size_iter(include="*.md", exclude="docs/")) == [20]
+    assert tree.joinpath("main.py").size(exclude="*.py") == 10
+
+
+@pytest.fixture
+def repo(tree: Path) -> Path:
+    tree.joinpath(".gitignore").write_text("# comment\n*.log\n.git/\nbuild/\n")
+    tree.joinpath("src/.gitignore").write_text("!app.log\n/app.py\n")
+    tree.joinpath("docs/.gitignore").write_text("!build/\n")
+
+    yield tree
+
+
+@pytest.mark.parametrize(
+    "rules, path, result",
+    [
+        (["*.log", "!keep.log"], "keep.log", True),
+        (["!keep.log", "*.log"], "keep.log", False),
+        (["\\!important"], "!important", False),
+        (["\\#hash"], "#hash", False),
+        (["space\\ "], "space ", False),
+        (["trailing   "], "trailing", False),
+        (["/anchored"], "sub/anchored", True),
+        (["doc/*.md"], "doc/a.md", False),
+        (["dir/"], "dir", True),
+    ],
+)
+def test_gitignore_rules(rules, path: str, result: bool):
+    assert GitIgnore(rules=rules).accept_file(path) is result
+
+
+def test_gitignore_hierarchy(repo: Path):
+    root = GitIgnore().for_directory(os.fspath(repo), "")
+    src = root.for_directory(os.fspath(repo / "src"), "src/")
+
+    assert root.accept_file("debug.log") is False
+    assert src.accept_file("src/app.log") is True
+    assert src.accept_file("src/app.py") is False
+    assert src.accept_file("src/sub/app.py") is True
+    assert src.accept_dir("src/build") is False
+    assert root.for_directory(os.fspath(repo / "node_modules"), "node_modules/") is root
+
+
+def test_iterdir_gitignore(repo: Path):
+    files = repo.iterdir(recursive=True, ignore=".gitignore")
+
+    assert relpaths(repo, files) == {
+        ".gitignore",
+        "main.py",
+        "README.md",
+        "src/.gitignore",
+        "src/app.log",
+        "node_modules/pkg/index.js",
+        "docs/.gitignore",
+        "docs/build/index.md",
+    }
+
+
+def test_iterdir_gitignore_combined(repo: Path):
+    files = repo.iterdir(
+        recursive=True, ignore=GitIgnore(), include="*.py", exclude="node_modules/"
+    )
+
+    assert relpaths(repo, files) == {"main.py"}
+
+
+def test_iterdir_gitignore_not_recursive(repo: Path):
+    files = repo.iterdir(ignore=".gitignore")
+
+    assert relpaths(repo, files) == {
+        ".gitignore",
+        "main.py",
+        "README.md",
+        "src",
+        "node_modules",
+        "docs",
+    }
+
+
+def test_gitignore_filenames(repo: Path):
+    repo.joinpath(".dockerignore").write_text("node_modules/\n")
+
+    files = repo.iterdir(recursive=True, ignore=[".gitignore", ".dockerignore"])
+
+    assert "node_modules/pkg/index.js" not in relpaths(repo, files)
+
+
+@pytest.mark.parametrize("top_down", [True, False])
+def test_walk_gitignore(repo: Path, top_down: bool):
+    roots = relpaths(repo, (r for r, *_ in repo.walk(top_down, ignore=".gitignore")))
+
+    assert roots == {
+        ".",
+        "src",
+        "node_modules",
+        "node_modules/pkg",
+        "docs",
+        "docs/build",
+    }
+
+
+def test_size_gitignore(repo: Path):
+    files = repo.iterdir(recursive=True, ignore=".gitignore")
+
+    assert repo.size(ignore=".gitignore") == sum(f.size() for f in files)
+
+
+@pytest.mark.parametrize("archive", ["repo.zip", "repo.tar.gz"])
+def test_make_archive_gitignore(repo: Path, tmp_path_factory, archive: str):
+    file = repo.make_archive(
+        tmp_path_factory.mktemp("archive") / archive, ignore=".gitignore"
+    )
+
+    names = {name for name, *_ in file.hexdigest_archive()}
+    expected = {
+        f"{repo.name}/{p}"
+        for p in relpaths(repo, repo.iterdir(recursive=True, ignore=".gitignore"))
+    }
+
+    assert names == expected
+
+
+def test_make_archive_gitignore_format(repo: Path, tmp_path_factory, mocker):
+    mocker.patch.object(Path, "_find_archive_format", return_value="7z")
+
+    with pytest.raises(ValueError, match="not supported"):
+        repo.make_archive(tmp_path_factory.mktemp("archive") / "x.7z", ignore=".x")
+
+
+def archive_names(file: Path) -> set:
+    if zipfile.is_zipfile(file):
+        with zipfile.ZipFile(file) as archive:
+            return {name.rstrip("/") for name in archive.namelist()}
+
+    with tarfile.open(file) as archive:
+        return set(archive.getnames())
+
+
+@pytest.mark.skipif(sys.platform == "win32", reason="symlinks need privileges")
+@pytest.mark.parametrize("archive", ["tree.zip", "tree.tar.gz"])
+def test_make_archive_symlink(tree: Path, tmp_path_factory, archive: str):
+    tree.joinpath("src/link").symlink_to(tree / "docs", target_is_directory=True)
+    dst = tmp_path_factory.mktemp("archive")
+
+    plain = archive_names(tree.make_archive(dst / f"plain-{archive}"))
+    filtered = archive_names(tree.make_archive(dst / archive, exclude="*.log"))
+
+    assert f"{tree.name}/src/link" in filtered
+    assert f"{tree.name}/src/link/build" not in filtered
+    assert filtered == {name for name in plain if not name.endswith(".log")}
+
+
+def test_make_archive_filters_kwargs(tree: Path, tmp_path: pathlib.Path):
+    with pytest.raises(TypeError, match="owner"):
+        tree.make_archive(tmp_path / "tree.tar", exclude="*.log", owner="root")
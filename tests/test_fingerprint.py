@@ -0,0 +1,74 @@
+import hashlib
+import pathlib
+
+import pytest
+
+from pathlibutil import Path
+
+
+@pytest.fixture
+def large_file(tmp_path: pathlib.Path) -> Path:
+    file = Path(tmp_path, "large.bin")
+    file.write_bytes(bytes(range(256)) * 1024)
+
+    yield file
+
+
+def fingerprint(data: bytes, sample: int, algorithm: str = "md5") -> str:
+    size = len(data)
+    hash = hashlib.new(algorithm, size.to_bytes(8, "little"))
+
+    if size <= 3 * sample:
+        hash.update(data)
+    else:
+        for offset in (0, (size - sample) // 2, size - sample):
+            hash.update(data[offset:][:sample])
+
+    return hash.hexdigest()
+
+
+@pytest.mark.parametrize("sample", [1, 100, 4096, 2**20])
+def test_fingerprint(large_file: Path, sample: int):
+    data = large_file.read_bytes()
+
+    assert large_file.hexdigest(fingerprint=sample) == fingerprint(data, sample)
+
+
+def test_fingerprint_default(large_file: Path):
+    data = large_file.read_bytes()
+
+    assert large_file.hexdigest("sha1", fingerprint=True) == fingerprint(
+        data, 2**16, "sha1"
+    )
+    assert large_file.hexdigest("sha1") == hashlib.sha1(data).hexdigest()
+
+
+def test_fingerprint_detects(large_file: Path):
+    digest = large_file.hexdigest(fingerprint=16)
+
+    with large_file.open("r+b") as f:
+        f.seek(large_file.size() - 1)
+        f.write(b"\x00")
+
+    assert large_file.verify(digest, fingerprint=16) is False
+
+    digest = large_file.hexdigest(fingerprint=16)
+
+    with large_file.open("r+b") as f:
+        f.seek(1000)
+        f.write(b"\xff")
+
+    assert large_file.verify(digest, fingerprint=16) is True
+
+
+def test_fingerprint_io(large_file: Path, mocker):
+    spy = mocker.spy(Path, "_read_chunks")
+
+    _ = large_file.hexdigests(["md5", "sha256"], fingerprint=True)
+
+    assert spy.call_count == 0
+
+
+def test_fingerprint_raises(large_file: Path):
+    with pytest.raises(ValueError):
+        _ = large_file.hexdigest(fingerprint=-1)
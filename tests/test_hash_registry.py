@@ -0,0 +1,112 @@
+import sys
+import zlib
+
+import pytest
+
+from pathlibutil import Path
+from pathlibutil.blockmap import BlockMap
+
+
+@pytest.fixture
+def content(file: Path) -> bytes:
+    with open(file, "rb") as f:
+        return f.read()
+
+
+def test_crc32(file: Path, content: bytes):
+    assert file.hexdigest("crc32") == f"{zlib.crc32(content):08x}"
+    assert file.verify(f"{zlib.crc32(content):08x}", "crc32")
+
+
+def test_adler32(file: Path, content: bytes, cls: Path):
+    cls.default_chunk_size = 100
+    cls.default_hash = "adler32"
+
+    assert file.hexdigest() == f"{zlib.adler32(content):08x}"
+
+
+def test_zlib_hash():
+    hash = Path._new_hash("crc32")
+    hash.update(b"123456789")
+    copy = hash.copy()
+    copy.update(b"0")
+
+    assert hash.hexdigest() == "cbf43926"
+    assert hash.digest() == bytes.fromhex("cbf43926")
+    assert copy.hexdigest() != hash.hexdigest()
+    assert hash.name == "crc32"
+
+
+def test_hexdigests_registered(file: Path, content: bytes):
+    digests = file.hexdigests(["crc32", "md5"])
+
+    assert digests["crc32"] == f"{zlib.crc32(content):08x}"
+    assert digests["md5"] == file.hexdigest("md5")
+
+
+def test_hexdigest_tree_registered(file: Path):
+    tree = dict(file.parent.hexdigest_tree("adler32"))
+
+    assert tree[Path(file.name)] == file.hexdigest("adler32")
+    assert len(tree[Path(".")]) == 8
+
+
+def test_blockmap_registered(tmp_path):
+    file = Path(tmp_path, "disk.img")
+    file.write_bytes(b"\x01" * 5000)
+
+    blockmap = BlockMap.from_file(file, "crc32", block_size=1024)
+
+    assert len(blockmap.digests) == 5
+    assert blockmap.root == file.hexdigest_blocks("crc32", block_size=1024)[0]
+
+
+def test_unknown_algorithm(file: Path):
+    with pytest.raises(ValueError):
+        file.hexdigest("crc33")
+
+
+@pytest.mark.parametrize(
+    "algorithm, module",
+    [
+        ("xxh64", "xxhash"),
+        ("xxh3_64", "xxhash"),
+        ("xxh3_128", "xxhash"),
+        ("blake3", "blake3"),
+    ],
+)
+def test_optional_missing(file: Path, algorithm: str, module: str, mocker):
+    mocker.patch.dict(sys.modules, {module: None})
+    mocker.patch.dict(Path._hash_constructors, clear=True)
+
+    with pytest.raises(ModuleNotFoundError, match=f"pip install {module}"):
+        file.hexdigest(algorithm)
+
+
+@pytest.mark.parametrize("algorithm", ["xxh64", "xxh3_64", "xxh3_128"])
+def test_xxhash(file: Path, content: bytes, algorithm: str):
+    xxhash = pytest.importorskip("xxhash")
+
+    assert file.hexdigest(algorithm) == getattr(xxhash, algorithm)(content).hexdigest()
+
+
+def test_blake3(file: Path, content: bytes):
+    blake3 = pytest.importorskip("blake3")
+
+    assert file.hexdigest("blake3") == blake3.blake3(content).hexdigest()
+
+
+def test_register_algorithm(file: Path, mocker):
+    mocker.patch.dict(Path._hash_algorithms)
+    mocker.patch.dict(Path._hash_constructors)
+
+    register = mocker.Mock(return_value=lambda: Path._new_hash("sha1"))
+
+    class RegisterFooHash(Path, algorithm="foo"):
+        _register_hash_algorithm = register
+
+    assert "foo" in file.algorithms_available
+    assert file.hexdigest("foo") == file.hexdigest("sha1")
+    assert file.hexdigest("foo") == file.hexdigest("sha1")
+
+    register.assert_called_once()
@@ -0,0 +1,67 @@
+import hashlib
+import pathlib
+
+import pytest
+
+from pathlibutil import Path
+
+
+@pytest.fixture
+def data(tmp_path: pathlib.Path) -> Path:
+    root = Path(tmp_path, "data")
+    root.joinpath("sub/empty").mkdir(parents=True)
+    root.joinpath("a.txt").write_bytes(b"a" * 1000)
+    root.joinpath("sub/b.bin").write_bytes(bytes(range(256)) * 10)
+
+    yield root
+
+
+@pytest.fixture
+def expected(data: Path) -> dict:
+    return {
+        "data/a.txt": (1000, hashlib.sha256(b"a" * 1000).hexdigest()),
+        "data/sub/b.bin": (2560, hashlib.sha256(bytes(range(256)) * 10).hexdigest()),
+    }
+
+
+@pytest.mark.parametrize(
+    "archive", ["data.zip", "data.tar", "data.tar.gz", "data.tar.bz2", "data.tar.xz"]
+)
+def test_hexdigest_archive(data: Path, expected: dict, archive: str, cls: Path):
+    cls.default_chunk_size = 100
+    file = data.make_archive(data.parent.joinpath(archive))
+
+    result = {
+        name: (size, digest) for name, size, digest in file.hexdigest_archive("sha256")
+    }
+
+    assert result == expected
+
+
+def test_hexdigest_archive_format(data: Path, expected: dict):
+    file = data.make_archive(data.parent.joinpath("data.bin"), format="gztar")
+
+    name, size, digest = next(file.hexdigest_archive("sha256", format="gztar"))
+
+    assert expected[name] == (size, digest)
+    assert size.kb == size / 1000
+
+
+def test_hexdigest_archive_length(data: Path):
+    file = data.make_archive(data.parent.joinpath("data.zip"))
+
+    digests = [d for *_, d in file.hexdigest_archive("shake_128", length=8)]
+
+    assert all(len(d) == 16 for d in digests)
+
+
+def test_hexdigest_archive_unknown(data: Path):
+    with pytest.raises(ValueError, match="unknown archive format"):
+        next(data.joinpath("a.txt").hexdigest_archive())
+
+
+def test_hexdigest_archive_chunk_size(data: Path):
+    file = data.make_archive(data.parent.joinpath("data.zip"))
+
+    with pytest.raises(ValueError):
+        next(file.hexdigest_archive(chunk_size=-1))
@@ -0,0 +1,71 @@
+import hashlib
+import pathlib
+
+import pytest
+
+from pathlibutil import Path
+
+
+@pytest.fixture
+def data_file(tmp_path: pathlib.Path) -> Path:
+    file = Path(tmp_path, "data.bin")
+    file.write_bytes(bytes(range(256)) * 40)
+
+    yield file
+
+
+def expected(data: bytes, block_size: int, algorithm: str):
+    blocks = [data[i:][:block_size] for i in range(0, len(data) or 1, block_size)]
+    leaves = [hashlib.new(algorithm, block).digest() for block in blocks]
+    root = hashlib.new(algorithm, b"".join(leaves))
+
+    return root.hexdigest(), [leaf.hex() for leaf in leaves]
+
+
+@pytest.mark.parametrize("block_size", [1000, 1024, 2**20])
+@pytest.mark.parametrize("workers", [1, 3])
+def test_hexdigest_blocks(data_file: Path, block_size: int, workers: int):
+    result = data_file.hexdigest_blocks(
+        "blake2b", block_size=block_size, workers=workers, chunk_size=100
+    )
+
+    assert result == expected(data_file.read_bytes(), block_size, "blake2b")
+
+
+def test_hexdigest_blocks_default(data_file: Path):
+    root, leaves = data_file.hexdigest_blocks()
+
+    assert leaves == [data_file.hexdigest()]
+    assert root == hashlib.md5(bytes.fromhex(leaves[0])).hexdigest()
+
+
+def test_hexdigest_blocks_empty(tmp_path: pathlib.Path):
+    file = Path(tmp_path, "empty.bin")
+    file.touch()
+
+    assert file.hexdigest_blocks("sha1") == expected(b"", 10, "sha1")
+
+
+def test_hexdigest_blocks_processes(data_file: Path):
+    threads = data_file.hexdigest_blocks("sha256", block_size=4096)
+    processes = data_file.hexdigest_blocks(
+        "sha256", block_size=4096, processes=True, workers=2
+    )
+
+    assert threads == processes
+
+
+def test_hexdigest_blocks_length(data_file: Path):
+    root, leaves = data_file.hexdigest_blocks("shake_128", block_size=4096, length=4)
+
+    assert len(root) == 8
+    assert len(leaves) == 3
+    assert all(len(leaf) == 8 for leaf in leaves)
+
+
+def test_hexdigest_blocks_raises(data_file: Path):
+    with pytest.raises(FileNotFoundError):
+        _ = Path(data_file.parent).hexdigest_blocks()
+
+    with pytest.raises(ValueError):
+        _ = data_file.hexdigest_blocks(block_size=0)
@@ -0,0 +1,151 @@
+import hashlib
+import itertools
+import os
+import pathlib
+
+import pytest
+
+from pathlibutil import Path
+from pathlibutil.path import _workers
+
+
+@pytest.fixture
+def files(tmp_path: pathlib.Path):
+    files = []
+
+    for i in range(20):
+        file = tmp_path.joinpath(f"file{i:02}.txt")
+        file.write_bytes(bytes(i) * 1000)
+        files.append(file)
+
+    yield files
+
+
+def test_hexdigest_iter():
+    assert hasattr(Path, "hexdigest_iter")
+
+
+@pytest.mark.parametrize("ordered", [True, False])
+@pytest.mark.parametrize("workers", [1, 4])
+def test_hexdigest_iter_results(files, ordered, workers):
+    result = list(
+        Path.hexdigest_iter(files, "sha256", workers=workers, ordered=ordered)
+    )
+
+    assert len(result) == len(files)
+    assert all(isinstance(p, Path) for p, _ in result)
+
+    for path, digest in result:
+        assert digest == hashlib.sha256(path.read_bytes()).hexdigest()
+
+    if ordered:
+        assert [p for p, _ in result] == [Path(f) for f in files]
+
+
+def test_hexdigest_iter_exception(files, tmp_path: pathlib.Path):
+    missing = tmp_path.joinpath("missing.txt")
+
+    result = dict(Path.hexdigest_iter([*files, missing, tmp_path]))
+
+    assert isinstance(result[Path(missing)], FileNotFoundError)
+    assert isinstance(result[Path(tmp_path)], FileNotFoundError)
+    assert all(isinstance(result[Path(f)], str) for f in files)
+
+
+def test_hexdigest_iter_kwargs(files):
+    result = dict(Path.hexdigest_iter(files[:2], "shake_128", length=4))
+
+    assert all(len(digest) == 8 for digest in result.values())
+
+
+def test_hexdigest_iter_generator(files, tmp_path: pathlib.Path):
+    result = dict(Path.hexdigest_iter(Path(tmp_path).iterdir(recursive=True)))
+
+    assert len(result) == len(files)
+
+
+def test_hexdigest_iter_bounded(files):
+    consumed = []
+
+    def generator():
+        for file in itertools.cycle(files):
+            consumed.append(file)
+            yield file
+
+    it = Path.hexdigest_iter(generator(), workers=2, pending=3)
+
+    for _ in range(5):
+        next(it)
+
+    assert len(consumed) <= 5 + 3
+
+    it.close()
+
+
+def test_hexdigest_iter_pending_default(files):
+    consumed = []
+
+    def generator():
+        for file in itertools.cycle(files):
+            consumed.append(file)
+            yield file
+
+    it = Path.hexdigest_iter(generator(), workers=1)
+
+    for _ in range(5):
+        next(it)
+
+    assert len(consumed) <= 5 + 2
+
+    it.close()
+
+
+def test_workers_default():
+    assert _workers(5) == 5
+    assert _workers(None) == min(32, (os.cpu_count() or 1) + 4)
+    assert _workers(None, processes=True) == (os.cpu_count() or 1)
+
+
+def test_hexdigest_iter_raises(files):
+    with pytest.raises(ValueError):
+        list(Path.hexdigest_iter(files, pending=0))
+
+
+@pytest.mark.parametrize("batch_size", [None, 1, 3, 100])
+@pytest.mark.parametrize("ordered", [True, False])
+def test_hexdigest_iter_processes(files, batch_size, ordered):
+    result = list(
+        Path.hexdigest_iter(
+            files,
+            "sha1",
+            processes=True,
+            workers=2,
+            batch_size=batch_size,
+            ordered=ordered,
+        )
+    )
+
+    assert len(result) == len(files)
+    assert all(isinstance(p, Path) for p, _ in result)
+
+    for path, digest in result:
+        assert digest == hashlib.sha1(path.read_bytes()).hexdigest()
+
+    if ordered:
+        assert [p for p, _ in result] == [Path(f) for f in files]
+
+
+def test_hexdigest_iter_processes_exception(files, tmp_path: pathlib.Path):
+    missing = tmp_path.joinpath("missing.txt")
+
+    result = dict(
+        Path.hexdigest_iter([missing, *files], processes=True, workers=1, length=4)
+    )
+
+    assert isinstance(result[Path(missing)], FileNotFoundError)
+    assert all(isinstance(result[Path(f)], str) for f in files)
+
+
+def test_hexdigest_iter_batch_size_raises(files):
+    with pytest.raises(ValueError):
+        list(Path.hexdigest_iter(files, batch_size=0))
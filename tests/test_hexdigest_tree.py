@@ -0,0 +1,101 @@
+import hashlib
+import pathlib
+import shutil
+
+import pytest
+
+from pathlibutil import Path
+
+
+@pytest.fixture
+def tree(tmp_path: pathlib.Path) -> Path:
+    files = {
+        "a.txt": "a",
+        "b/c.txt": "c",
+        "b/d/e.txt": "e",
+        "f/g.txt": "g",
+    }
+
+    root = Path(tmp_path, "tree")
+
+    for name, content in files.items():
+        file = root.joinpath(name)
+        file.parent.mkdir(parents=True, exist_ok=True)
+        file.write_text(content)
+
+    root.joinpath("empty").mkdir()
+
+    yield root
+
+
+def test_hexdigest_tree(tree: Path):
+    result = list(tree.hexdigest_tree())
+
+    assert result[-1][0] == Path(".")
+    assert all(isinstance(p, Path) for p, _ in result)
+
+    digests = dict(result)
+
+    assert set(digests) == {
+        Path("."),
+        Path("a.txt"),
+        Path("b"),
+        Path("b/c.txt"),
+        Path("b/d"),
+        Path("b/d/e.txt"),
+        Path("empty"),
+        Path("f"),
+        Path("f/g.txt"),
+    }
+    assert digests[Path("a.txt")] == hashlib.md5(b"a").hexdigest()
+    assert digests[Path("empty")] == hashlib.md5(b"").hexdigest()
+
+
+def test_hexdigest_tree_order(tree: Path):
+    paths = [p for p, _ in tree.hexdigest_tree()]
+
+    assert paths.index(Path("b/d/e.txt")) < paths.index(Path("b/d"))
+    assert paths.index(Path("b/d")) < paths.index(Path("b"))
+
+
+def test_hexdigest_tree_compare(tree: Path, tmp_path: pathlib.Path):
+    other = Path(shutil.copytree(tree, tmp_path / "other"))
+
+    assert tree.hexdigest(recursive=True) == other.hexdigest(recursive=True)
+
+    other.joinpath("b/d/e.txt").write_text("modified")
+
+    a = dict(tree.hexdigest_tree("sha256"))
+    b = dict(other.hexdigest_tree("sha256"))
+
+    assert [p for p in a if a[p] != b[p]] == [
+        Path("b/d/e.txt"),
+        Path("b/d"),
+        Path("b"),
+        Path("."),
+    ]
+
+
+@pytest.mark.parametrize("name", ["a.txt", "b/d/e.txt", "empty"])
+def test_hexdigest_tree_rename(tree: Path, name: str):
+    digest = tree.hexdigest(recursive=True)
+
+    path = tree.joinpath(name)
+    path.rename(path.with_name("renamed"))
+
+    assert tree.hexdigest(recursive=True) != digest
+
+
+def test_hexdigest_tree_verify(tree: Path):
+    digest = tree.hexdigest("shake_128", recursive=True, length=8)
+
+    assert len(digest) == 16
+    assert tree.verify(digest, "shake_128", recursive=True, length=8) is True
+
+
+def test_hexdigest_tree_raises(tree: Path):
+    with pytest.raises(FileNotFoundError):
+        list(tree.joinpath("a.txt").hexdigest_tree())
+
+    with pytest.raises(FileNotFoundError):
+        _ = tree.hexdigest()
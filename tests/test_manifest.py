@@ -0,0 +1,152 @@
+import hashlib
+import pathlib
+import subprocess
+
+import pytest
+
+from pathlibutil import Path
+from pathlibutil.manifest import (
+    ManifestEntry,
+    read_manifest,
+    verify_manifest,
+    write_manifest,
+)
+
+
+@pytest.fixture
+def data(tmp_path: pathlib.Path) -> Path:
+    files = {
+        "data/a.txt": "a",
+        "data/sub/b.txt": "bb",
+        "data/sub/c d.txt": "ccc",
+    }
+
+    for name, content in files.items():
+        file = tmp_path.joinpath(name)
+        file.parent.mkdir(parents=True, exist_ok=True)
+        file.write_text(content)
+
+    yield Path(tmp_path, "data")
+
+
+def test_write_manifest(data: Path):
+    manifest = write_manifest(data.parent / "SHA256SUMS", data.iterdir(recursive=True))
+
+    assert isinstance(manifest, Path)
+
+    entries = sorted(read_manifest(manifest), key=lambda e: e.filename)
+
+    assert entries == [
+        ManifestEntry(hashlib.sha256(b"a").hexdigest(), "data/a.txt"),
+        ManifestEntry(hashlib.sha256(b"bb").hexdigest(), "data/sub/b.txt"),
+        ManifestEntry(hashlib.sha256(b"ccc").hexdigest(), "data/sub/c d.txt"),
+    ]
+
+
+@pytest.mark.parametrize(
+    "name, algorithm",
+    [
+        ("SHA1SUMS", "sha1"),
+        ("files.md5", "md5"),
+        ("checksums.sha512", "sha512"),
+        ("checksums.txt", "md5"),
+    ],
+)
+def test_write_manifest_algorithm(data: Path, name: str, algorithm: str):
+    manifest = write_manifest(data / name, [data / "a.txt"])
+
+    entry = next(read_manifest(manifest))
+
+    assert entry.digest == hashlib.new(algorithm, b"a").hexdigest()
+    assert entry.filename == "a.txt"
+
+
+def test_write_manifest_size(data: Path):
+    manifest = write_manifest(data / "files.md5", [data / "a.txt"], size=True)
+
+    assert next(read_manifest(manifest)).size == 1
+
+
+def test_write_manifest_raises(data: Path):
+    with pytest.raises(FileNotFoundError):
+        write_manifest(data / "files.md5", [data / "missing.txt"])
+
+
+def test_read_manifest(tmp_path: pathlib.Path):
+    manifest = Path(tmp_path, "manifest.txt")
+    manifest.write_text(
+        "# comment\n"
+        "\n"
+        "D41D8CD98F00B204E9800998ECF8427E  text mode.txt\n"
+        "d41d8cd98f00b204e9800998ecf8427e *binary.txt\n"
+        "d41d8cd98f00b204e9800998ecf8427e 0 *sized.txt\n"
+        "\\d41d8cd98f00b204e9800998ecf8427e *back\\\\slash\\nnewline.txt\n"
+        "MD5 (bsd (1).txt) = d41d8cd98f00b204e9800998ecf8427e\n"
+    )
+
+    digest = hashlib.md5().hexdigest()
+
+    assert list(read_manifest(manifest)) == [
+        ManifestEntry(digest, "text mode.txt"),
+        ManifestEntry(digest, "binary.txt"),
+        ManifestEntry(digest, "sized.txt", 0),
+        ManifestEntry(digest, "back\\slash\nnewline.txt"),
+        ManifestEntry(digest, "bsd (1).txt", algorithm="MD5"),
+    ]
+
+
+def test_read_manifest_raises(tmp_path: pathlib.Path):
+    manifest = Path(tmp_path, "manifest.txt")
+    manifest.write_text("no checksum\n")
+
+    with pytest.raises(ValueError):
+        list(read_manifest(manifest))
+
+
+def test_verify_manifest(data: Path):
+    manifest = write_manifest(
+        data / "SHA256SUMS", data.iterdir(recursive=True), size=True
+    )
+
+    assert all(result is True for _, result in verify_manifest(manifest))
+
+    data.joinpath("a.txt").write_text("b")
+    data.joinpath("sub/b.txt").write_text("b")
+    data.joinpath("sub/c d.txt").unlink()
+
+    results = dict(verify_manifest(manifest, ordered=True))
+
+    assert results[data / "a.txt"] is False
+    assert results[data / "sub/b.txt"] is False
+    assert isinstance(results[data / "sub/c d.txt"], FileNotFoundError)
+
+
+def test_verify_manifest_size_first(data: Path, mocker):
+    manifest = write_manifest(data / "files.md5", [data / "a.txt"], size=True)
+    data.joinpath("a.txt").write_text("")
+
+    spy = mocker.spy(Path, "verify")
+
+    assert dict(verify_manifest(manifest)) == {data / "a.txt": False}
+    assert spy.call_count == 0
+
+
+def test_verify_manifest_bsd(data: Path):
+    manifest = Path(data, "checksums.txt")
+    manifest.write_text(f"SHA1 (a.txt) = {hashlib.sha1(b'a').hexdigest()}\n")
+
+    assert dict(verify_manifest(manifest)) == {data / "a.txt": True}
+
+
+def test_manifest_sha256sum(data: Path):
+    manifest = write_manifest(data.parent / "SHA256SUMS", data.iterdir(recursive=True))
+
+    try:
+        result = subprocess.run(
+            ["sha256sum", "--check", "--quiet", manifest.name],
+            cwd=manifest.parent,
+        )
+    except FileNotFoundError:
+        pytest.skip("sha256sum is not available")
+
+    assert result.returncode == 0
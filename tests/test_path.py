@@ -2,11 +2,12 @@ import hashlib
 import os
 import pathlib
 import random
+import sys
 from types import GeneratorType
 
 import pytest
 
-from pathlibutil import Path
+from pathlibutil import ByteInt, Path
 
 
 @pytest.fixture(scope="function")
@@ -98,7 +99,8 @@ def test_algorithms_available(file: Path):
     p = file.algorithms_available
 
     assert isinstance(p, set)
-    assert hashlib.algorithms_available == p
+    assert hashlib.algorithms_available <= p
+    assert {"crc32", "adler32", "xxh64", "blake3"} <= p
 
 
 def test_read_lines(file: Path):
@@ -169,6 +171,133 @@ def test_size_dir(tmp_path: pathlib.Path):
     )
 
 
+def test_size_nested(tmp_path: pathlib.Path):
+    tmp_path.joinpath("a/b/c").mkdir(parents=True)
+    tmp_path.joinpath("a/1.txt").write_bytes(b"1" * 10)
+    tmp_path.joinpath("a/b/c/2.txt").write_bytes(b"2" * 20)
+    tmp_path.joinpath("3.txt").write_bytes(b"3" * 30)
+
+    size = Path(tmp_path).size()
+
+    assert size == 60
+    assert isinstance(size, ByteInt)
+
+
+@pytest.mark.parametrize("kwargs", [{"bogus": 1}, {"exlude": "*.txt"}])
+def test_size_kwargs(file: Path, tmp_path: pathlib.Path, kwargs):
+    with pytest.raises(TypeError):
+        Path(tmp_path).size(**kwargs)
+
+    with pytest.raises(TypeError):
+        file.size(**kwargs)
+
+
+@pytest.mark.skipif(sys.platform == "win32", reason="paths exceed MAX_PATH")
+def test_size_deep(tmp_path: pathlib.Path):
+    limit = sys.getrecursionlimit()
+    deep = tmp_path
+
+    for _ in range(300):
+        deep = deep.joinpath("d")
+        deep.mkdir()
+
+    deep.joinpath("file.txt").write_bytes(b"x" * 5)
+
+    try:
+        sys.setrecursionlimit(250)
+        assert Path(tmp_path).size() == 5
+    finally:
+        sys.setrecursionlimit(limit)
+        deep.joinpath("file.txt").unlink()
+
+        while deep != tmp_path:
+            deep.rmdir()
+            deep = deep.parent
+
+
+@pytest.mark.skipif(sys.platform == "win32", reason="symlinks need privileges")
+def test_size_symlink_loop(tmp_path: pathlib.Path):
+    tmp_path.joinpath("dir").mkdir()
+    tmp_path.joinpath("dir/file.txt").write_bytes(b"x" * 5)
+    tmp_path.joinpath("dir/loop").symlink_to(tmp_path, target_is_directory=True)
+
+    assert Path(tmp_path, "dir").size() == 10
+
+
+@pytest.mark.skipif(sys.platform == "win32", reason="hardlinks need ntfs")
+def test_size_unique(tmp_path: pathlib.Path):
+    tmp_path.joinpath("a").mkdir()
+    tmp_path.joinpath("a/file.txt").write_bytes(b"x" * 100)
+    tmp_path.joinpath("b").mkdir()
+    os.link(tmp_path / "a/file.txt", tmp_path / "b/link.txt")
+    os.link(tmp_path / "a/file.txt", tmp_path / "link.txt")
+    tmp_path.joinpath("other.txt").write_bytes(b"y" * 10)
+
+    assert Path(tmp_path).size() == 310
+    assert Path(tmp_path).size(unique=True) == 110
+
+
+@pytest.mark.skipif(not hasattr(os.stat_result, "st_blocks"), reason="st_blocks")
+def test_size_allocated(tmp_path: pathlib.Path):
+    sparse = tmp_path.joinpath("sparse.img")
+
+    with sparse.open("wb") as f:
+        f.truncate(2**24)
+
+    directory = os.stat(tmp_path).st_blocks * 512
+    expected = directory + os.stat(sparse).st_blocks * 512
+
+    assert Path(sparse).size() == 2**24
+    assert Path(sparse).size(allocated=True) < 2**24
+    assert Path(tmp_path).size(allocated=True) == expected
+
+
+def test_size_allocated_fallback(file: Path, mocker):
+    stat = mocker.Mock(spec=["st_size"], st_size=123)
+
+    assert file._disk_usage(stat, allocated=True) == 123
+
+
+@pytest.fixture
+def size_tree(tmp_path: pathlib.Path) -> Path:
+    for name in "abc":
+        tmp_path.joinpath(name).mkdir()
+
+        for index in range(10):
+            tmp_path.joinpath(name, f"{index}.txt").write_bytes(b"x" * 100)
+
+    yield Path(tmp_path)
+
+
+def test_size_limit(size_tree: Path, mocker):
+    spy = mocker.spy(os, "scandir")
+
+    assert size_tree.size(limit=3000) == 3000
+    assert spy.call_count == 4
+
+    spy.reset_mock()
+    size = size_tree.size(limit=250)
+
+    assert size == 300
+    assert isinstance(size, ByteInt)
+    assert spy.call_count == 2
+
+
+def test_size_limit_file(file: Path):
+    assert file.size(limit=1) == file.size()
+
+
+def test_size_iter(size_tree: Path):
+    totals = list(size_tree.size_iter())
+
+    assert totals == list(range(100, 3001, 100))
+    assert all(isinstance(total, ByteInt) for total in totals)
+
+
+def test_size_iter_file(file: Path):
+    assert list(file.size_iter()) == [file.size()]
+
+
 def test_size_raises(tmp_path: pathlib.Path):
     with pytest.raises(FileNotFoundError):
         _ = Path(tmp_path / "nonexistent").size()
@@ -231,3 +360,74 @@ def test_inheritance(cls):
         pass
 
     assert issubclass(PathB, cls)
+
+
+@pytest.mark.parametrize("chunk_size", [1, 7, 4096, 2**20])
+def test_hexdigest_chunk_size(cls: Path, algorithm: str, chunk_size: int):
+    p = cls(__file__).hexdigest(algorithm, chunk_size=chunk_size)
+
+    assert p == hashlib.new(algorithm, open(__file__, "rb").read()).hexdigest()
+
+
+def test_hexdigest_chunk_size_classvar(cls: Path, mocker):
+    spy = mocker.spy(cls, "_read_chunks")
+
+    cls.default_chunk_size = 13
+    p = cls(__file__).hexdigest()
+
+    assert spy.call_count == 1
+    assert p == hashlib.new("md5", open(__file__, "rb").read()).hexdigest()
+
+
+def test_hexdigest_chunk_size_raises(file: Path):
+    with pytest.raises(ValueError):
+        _ = file.hexdigest(chunk_size=-1)
+
+
+def test_hexdigest_streaming(file: Path, mocker):
+    mocker.patch.object(Path, "read_bytes", side_effect=MemoryError)
+
+    assert file.hexdigest() == hashlib.md5(open(file, "rb").read()).hexdigest()
+    assert file.verify(file.hexdigest(), chunk_size=16) is True
+
+
+def test_hexdigests(cls: Path, algorithm: str, shake: str, length: int):
+    data = open(__file__, "rb").read()
+
+    p = cls(__file__).hexdigests([algorithm, shake, "md5"], length=length)
+
+    assert p == {
+        algorithm: hashlib.new(algorithm, data).hexdigest(),
+        shake: hashlib.new(shake, data).hexdigest(length),
+        "md5": hashlib.md5(data).hexdigest(),
+    }
+
+
+def test_hexdigests_length_dict(cls: Path):
+    data = open(__file__, "rb").read()
+
+    p = cls(__file__).hexdigests(
+        ["shake_128", "shake_256"], length={"shake_128": 4, "shake_256": 8}
+    )
+
+    assert p["shake_128"] == hashlib.shake_128(data).hexdigest(4)
+    assert p["shake_256"] == hashlib.shake_256(data).hexdigest(8)
+
+    with pytest.raises(TypeError):
+        _ = cls(__file__).hexdigests(["shake_128"], length={"shake_256": 8})
+
+
+def test_hexdigests_single_read(cls: Path, mocker):
+    spy = mocker.spy(cls, "_read_chunks")
+
+    _ = cls(__file__).hexdigests(["md5", "sha1", "sha256"])
+
+    assert spy.call_count == 1
+
+
+def test_hexdigests_raises(cls: Path, tmp_path: pathlib.Path):
+    with pytest.raises(FileNotFoundError):
+        _ = cls(tmp_path).hexdigests(["md5"])
+
+    with pytest.raises(ValueError):
+        _ = cls(__file__).hexdigests([])
@@ -0,0 +1,292 @@
+import asyncio
+import pathlib
+import shutil
+import threading
+import time
+from typing import List
+
+import pytest
+
+from pathlibutil import Path
+from pathlibutil.progress import Progress, ProgressReporter
+
+
+@pytest.fixture
+def data(tmp_path: pathlib.Path) -> Path:
+    root = Path(tmp_path, "data")
+    root.joinpath("sub").mkdir(parents=True)
+    root.joinpath("a.bin").write_bytes(b"a" * 10000)
+    root.joinpath("sub/b.bin").write_bytes(bytes(range(256)) * 20)
+
+    yield root
+
+
+@pytest.fixture
+def reports() -> List[Progress]:
+    return []
+
+
+@pytest.fixture
+def reporter(reports: List[Progress]) -> ProgressReporter:
+    return ProgressReporter(reports.append, interval=3600, step=1000)
+
+
+def test_progress():
+    progress = Progress(done=500, total=1000, elapsed=2.0)
+
+    assert progress.rate == 250.0
+    assert progress.mbps == 250.0 / 10**6
+    assert progress.percent == 50.0
+
+    assert Progress(0, 0, 0.0).percent == 100.0
+    assert Progress(0, None, 0.0).percent is None
+    assert Progress(0, None, 0.0).rate == 0.0
+
+
+def test_reporter_throttle(reports: List[Progress], reporter: ProgressReporter):
+    reporter.start(5000)
+
+    for _ in range(10):
+        reporter.update(250)
+
+    reporter.finish()
+
+    assert [p.done for p in reports] == [1000, 2000, 2500]
+    assert all(p.total == 5000 for p in reports)
+    assert [p.finished for p in reports] == [False, False, True]
+
+
+def test_reporter_interval(reports: List[Progress]):
+    reporter = ProgressReporter(reports.append, interval=0)
+
+    reporter.update(1)
+    reporter.set(10)
+
+    assert [p.done for p in reports] == [1, 10]
+
+
+def test_reporter_from_progress(reporter: ProgressReporter):
+    assert ProgressReporter.from_progress(None) is None
+    assert ProgressReporter.from_progress(reporter) is reporter
+    assert ProgressReporter.from_progress(print).callback is print
+
+
+def test_reporter_monitor(reports: List[Progress]):
+    reporter = ProgressReporter(reports.append, interval=0.01)
+    sizes = iter(range(1, 1000))
+
+    def measure() -> int:
+        size = next(sizes)
+
+        if size == 2:
+            raise FileNotFoundError
+
+        return size
+
+    with reporter.monitor(measure):
+        time.sleep(0.1)
+
+    assert reports[-1].finished is True
+    assert reports[-1].done > 2
+    assert all(p.done != 2 for p in reports)
+
+
+def test_hexdigest_progress(data: Path, cls: Path, reports, reporter):
+    cls.default_chunk_size = 1000
+    file = cls(data, "a.bin")
+
+    assert file.hexdigest(progress=reporter) == file.hexdigest()
+
+    assert reports[-1].done == 10000
+    assert reports[-1].total == 10000
+    assert reports[-1].finished is True
+    assert len(reports) == 11
+
+
+def test_hexdigest_progress_fingerprint(data: Path, reports, reporter):
+    data.joinpath("a.bin").hexdigest(fingerprint=1000, progress=reporter)
+
+    assert reports[-1].done == reports[-1].total == 3008
+
+
+def test_ahexdigest_progress(data: Path, cls: Path, reports, reporter):
+    cls.default_chunk_size = 1000
+    file = cls(data, "a.bin")
+
+    assert asyncio.run(file.ahexdigest(progress=reporter)) == file.hexdigest()
+    assert reports[-1].done == 10000
+    assert reports[-1].finished is True
+
+
+def test_copy_file_progress(data: Path, tmp_path: pathlib.Path, reports, reporter):
+    dst = data.joinpath("a.bin").copy(tmp_path / "dst", progress=reporter)
+
+    assert dst.read_bytes() == data.joinpath("a.bin").read_bytes()
+    assert dst.stat().st_mtime == data.joinpath("a.bin").stat().st_mtime
+    assert reports[-1].done == reports[-1].total == 10000
+
+
+def test_copy_dir_progress(data: Path, tmp_path: pathlib.Path, reports, reporter):
+    dst = data.copy(tmp_path / "dst", progress=reporter)
+
+    assert dst.joinpath("sub/b.bin").read_bytes() == bytes(range(256)) * 20
+    assert reports[-1].done == reports[-1].total == 15120
+    assert reports[-1].finished is True
+
+
+def test_copy_dir_progress_function(
+    data: Path, tmp_path: pathlib.Path, reports, reporter, mocker
+):
+    copy = mocker.Mock(wraps=shutil.copy)
+
+    data.copy(tmp_path / "dst", progress=reporter, copy_function=copy)
+
+    assert copy.call_count == 2
+    assert reports[-1].done == 15120
+
+
+def test_archive_progress(data: Path, tmp_path: pathlib.Path, reports, reporter):
+    archive = data.make_archive(tmp_path / "data.zip", progress=reporter)
+
+    assert reports[-1].done == archive.size()
+    assert reports[-1].total is None
+    assert reports[-1].finished is True
+
+    reports.clear()
+    archive.unpack_archive(tmp_path / "unpacked", progress=reporter)
+
+    assert reports[-1].done == reports[-1].total == 15120
+
+
+@pytest.mark.parametrize("name, format", [("data.zpy", "zip"), ("data.tpy", "gztar")])
+def test_archive_progress_format(
+    data: Path, tmp_path: pathlib.Path, reports, reporter, name, format
+):
+    archive = data.make_archive(tmp_path / name, format=format, progress=reporter)
+
+    assert archive.name == name
+    assert reports[-1].done == archive.size() > 0
+    assert reports[-1].finished is True
+
+
+def test_unpack_tar_progress(data: Path, tmp_path: pathlib.Path, reports, reporter):
+    archive = data.make_archive(tmp_path / "data.tar.gz")
+    archive.unpack_archive(tmp_path / "unpacked", progress=reporter)
+
+    assert reports[-1].done == 15120
+    assert reports[-1].total is None
+
+
+def test_reporter_reentrant(reports: List[Progress]):
+    def callback(progress: Progress) -> None:
+        reports.append(progress)
+
+        if not progress.finished:
+            reporter.update(1)
+
+    def run() -> None:
+        reporter.start(100)
+        reporter.update(50)
+        reporter.finish()
+
+    reporter = ProgressReporter(callback, interval=3600, step=10)
+    thread = threading.Thread(target=run, daemon=True)
+    thread.start()
+    thread.join(5)
+
+    assert not thread.is_alive(), "callback deadlocked on the reporter"
+    assert [p.done for p in reports] == [50, 51]
+
+
+def test_reporter_callback_unlocked():
+    entered, release = threading.Event(), threading.Event()
+
+    def callback(progress: Progress) -> None:
+        if not progress.finished:
+            entered.set()
+            release.wait(5)
+
+    reporter = ProgressReporter(callback, interval=3600, step=1)
+    reporter.start()
+
+    thread = threading.Thread(target=reporter.update, args=(1,))
+    thread.start()
+
+    try:
+        assert entered.wait(5)
+        assert reporter._lock.acquire(timeout=5)
+        reporter._lock.release()
+    finally:
+        release.set()
+        thread.join()
+
+
+def test_reporter_shared(reports: List[Progress], reporter: ProgressReporter):
+    reporter.start(5000)
+    shared = reporter.shared()
+
+    shared.start(100)
+    shared.update(1500)
+    shared.finish()
+
+    assert ProgressReporter.from_progress(shared) is shared
+    assert [(p.done, p.total, p.finished) for p in reports] == [(1500, 5000, False)]
+
+    with pytest.raises(TypeError):
+        shared.set(0)
+
+
+def test_hexdigest_iter_progress(data: Path, cls: Path, reports, reporter):
+    cls.default_chunk_size = 1000
+    files = [data.joinpath("a.bin"), data.joinpath("sub/b.bin")] * 5
+
+    digests = dict(cls.hexdigest_iter(files, workers=4, progress=reporter))
+
+    assert len(digests) == 2
+    assert [p.finished for p in reports].count(True) == 1
+    assert reports[-1].finished is True
+    assert reports[-1].done == 5 * 15120
+    assert reports[-1].total is None
+    assert [p.done for p in reports] == sorted(p.done for p in reports)
+
+
+def test_hexdigest_iter_progress_processes(data: Path, reporter):
+    with pytest.raises(ValueError, match="processes"):
+        next(Path.hexdigest_iter([data / "a.bin"], processes=True, progress=reporter))
+
+
+def test_hexdigest_tree_progress(data: Path, reports, reporter):
+    digest = data.hexdigest("sha1", recursive=True, progress=reporter)
+
+    assert digest == data.hexdigest("sha1", recursive=True)
+    assert [p.finished for p in reports].count(True) == 1
+    assert reports[-1].done == 15120
+
+
+@pytest.mark.parametrize("archive", ["data.zip", "data.tar.gz"])
+def test_unpack_progress_members(
+    data: Path, tmp_path: pathlib.Path, archive: str, reports, mocker
+):
+    file = data.make_archive(tmp_path / archive)
+    size = mocker.spy(Path, "size")
+
+    file.unpack_archive(
+        tmp_path / "unpacked", progress=ProgressReporter(reports.append, interval=0)
+    )
+
+    assert size.call_count == 0
+    assert [p.done for p in reports if not p.finished] == [10000, 15120]
+    assert reports[-1].finished is True
+    assert tmp_path.joinpath("unpacked/data/sub/b.bin").stat().st_size == 5120
+
+
+def test_unpack_progress_other_format(
+    data: Path, tmp_path: pathlib.Path, reports, reporter, mocker
+):
+    file = data.make_archive(tmp_path / "data.zip")
+    unpack = mocker.patch("shutil.unpack_archive")
+
+    file.unpack_archive(tmp_path / "unpacked", format="7z", progress=reporter)
+
+    unpack.assert_called_once()
+    assert [(p.done, p.finished) for p in reports] == [(0, True)]
@@ -0,0 +1,101 @@
+import pathlib
+import sys
+
+import pytest
+
+from pathlibutil import Path, SizeEstimate
+
+
+@pytest.fixture
+def tree(tmp_path: pathlib.Path) -> Path:
+    """3 levels with 4 subdirectories each, 10 files of 100 bytes per directory"""
+    dirs = [tmp_path]
+
+    for _ in range(3):
+        dirs = [d.joinpath(str(i)) for d in dirs for i in range(4)]
+
+        for d in dirs:
+            d.mkdir()
+
+    for d in tmp_path.glob("**/"):
+        for i in range(10):
+            d.joinpath(f"{i}.bin").write_bytes(b"x" * 100)
+
+    yield Path(tmp_path)
+
+
+def test_size_estimate_exact(tree: Path):
+    estimate = tree.size_estimate()
+
+    assert isinstance(estimate, SizeEstimate)
+    assert estimate.exact is True
+    assert estimate.exhaustive is True
+    assert estimate.size == tree.size() == 85 * 1000
+    assert estimate.scans == 85
+
+
+def test_size_estimate_uniform(tree: Path):
+    estimate = tree.size_estimate(max_scans=10, file_samples=3, seed=1)
+
+    assert estimate.size == tree.size()
+    assert estimate.scans < 85
+    assert estimate.low == estimate.high
+    assert estimate.exhaustive is False
+    assert estimate.exact is False
+
+
+def test_size_estimate_interval(tree: Path):
+    for i in range(4):
+        tree.joinpath(f"{i}/0/large.bin").write_bytes(b"x" * 10000)
+
+    size = tree.size()
+
+    estimate = tree.size_estimate(samples=200, max_scans=30, seed=4)
+
+    assert estimate.scans < 85
+    assert estimate.low < estimate.size < estimate.high
+    assert estimate.low <= size <= estimate.high
+    assert estimate.exact is False
+
+
+def test_size_estimate_budget(tree: Path):
+    estimate = tree.size_estimate(timeout=0, file_samples=1, seed=3)
+
+    assert estimate.samples == 2
+    assert estimate.scans <= 8
+
+
+def test_size_estimate_file(tmp_path: pathlib.Path):
+    file = Path(tmp_path, "file.txt")
+    file.write_bytes(b"x" * 10)
+
+    assert file.size_estimate() == (10, 10, 10, 0, 0, True)
+    assert file.size_estimate().exact is True
+
+
+def test_size_estimate_last_walk(tmp_path: pathlib.Path):
+    for name in "ab":
+        tmp_path.joinpath(name).mkdir()
+        tmp_path.joinpath(name, "file.bin").write_bytes(b"x" * 10)
+
+    estimate = Path(tmp_path).size_estimate(samples=2, seed=4)
+
+    assert estimate.scans == 3
+    assert estimate.exhaustive is True
+    assert estimate.size == 20
+
+
+@pytest.mark.skipif(sys.platform == "win32", reason="symlinks need privileges")
+def test_size_estimate_symlink(tmp_path: pathlib.Path):
+    tmp_path.joinpath("dir").mkdir()
+    tmp_path.joinpath("dir", "file.bin").write_bytes(b"x" * 2)
+    tmp_path.joinpath("tree").mkdir()
+    tmp_path.joinpath("tree", "file.bin").write_bytes(b"x" * 10)
+    tmp_path.joinpath("tree", "link").symlink_to(tmp_path / "dir")
+    tmp_path.joinpath("tree", "loop").symlink_to(tmp_path / "tree")
+
+    tree = Path(tmp_path, "tree")
+    estimate = tree.size_estimate()
+
+    assert estimate.exhaustive is True
+    assert estimate.size == tree.size()
@@ -0,0 +1,103 @@
+import os
+import pathlib
+import sys
+
+import pytest
+
+from pathlibutil import ByteInt, Path
+
+
+@pytest.fixture
+def tree(tmp_path: pathlib.Path) -> Path:
+    tmp_path.joinpath("a/b").mkdir(parents=True)
+    tmp_path.joinpath("c").mkdir()
+    tmp_path.joinpath("root.txt").write_bytes(b"x" * 1)
+    tmp_path.joinpath("a/a.txt").write_bytes(b"x" * 10)
+    tmp_path.joinpath("a/b/b1.txt").write_bytes(b"x" * 100)
+    tmp_path.joinpath("a/b/b2.txt").write_bytes(b"x" * 1000)
+
+    yield Path(tmp_path)
+
+
+def test_size_tree(tree: Path):
+    result = list(tree.size_tree())
+
+    assert dict(result) == {
+        Path("a/b"): (2, 1100),
+        Path("a"): (3, 1110),
+        Path("c"): (0, 0),
+        Path("."): (4, 1111),
+    }
+    assert result[-1][0] == Path(".")
+    assert result.index((Path("a/b"), (2, 1100))) < result.index((Path("a"), (3, 1110)))
+    assert all(isinstance(size, ByteInt) for _, (_, size) in result)
+
+
+def test_size_tree_matches_size(tree: Path):
+    for path, (_, size) in tree.size_tree():
+        assert size == tree.joinpath(path).size()
+
+
+@pytest.mark.skipif(sys.platform == "win32", reason="hardlinks need ntfs")
+def test_size_tree_unique(tree: Path):
+    os.link(tree / "a/b/b2.txt", tree / "c/link.txt")
+
+    assert dict(tree.size_tree())[Path(".")] == (5, 2111)
+    assert dict(tree.size_tree(unique=True))[Path(".")] == (4, 1111)
+
+
+def test_size_tree_allocated(tree: Path):
+    result = dict(tree.size_tree(allocated=True))
+
+    assert result[Path(".")][1] == tree.size(allocated=True)
+
+
+def test_size_tree_generator(tree: Path, mocker):
+    spy = mocker.spy(os, "scandir")
+    result = tree.size_tree()
+
+    path, _ = next(result)
+
+    assert path != Path(".")
+    assert spy.call_count < 4
+
+
+def test_size_tree_raises(tree: Path):
+    with pytest.raises(FileNotFoundError):
+        next(tree.joinpath("root.txt").size_tree())
+
+
+def test_size_tree_filters(tree: Path):
+    tree.joinpath(".git").mkdir()
+    tree.joinpath(".git/HEAD").write_bytes(b"x" * 10000)
+    tree.joinpath("a/debug.log").write_bytes(b"x" * 10000)
+
+    result = dict(tree.size_tree(exclude=[".git/", "*.log"]))
+
+    assert Path(".git") not in result
+    assert result[Path("a")] == (3, 1110)
+    assert result[Path(".")] == (4, 1111)
+    assert result[Path(".")][1] == tree.size(exclude=[".git/", "*.log"])
+
+
+def test_size_tree_include(tree: Path):
+    result = dict(tree.size_tree(include="b*.txt"))
+
+    assert result[Path("a/b")] == (2, 1100)
+    assert result[Path(".")] == (2, 1100)
+
+
+def test_size_tree_ignore(tree: Path):
+    tree.joinpath("a/.gitignore").write_text("b/\n")
+
+    result = dict(tree.size_tree(ignore=".gitignore"))
+
+    assert Path("a/b") not in result
+    assert result[Path(".")] == (3, 14)
+    assert result[Path(".")][1] == tree.size(ignore=".gitignore")
+
+
+@pytest.mark.parametrize("kwargs", [{"limit": 10}, {"exlude": "*.txt"}])
+def test_size_tree_unexpected_kwargs(tree: Path, kwargs):
+    with pytest.raises(TypeError):
+        tree.size_tree(**kwargs)
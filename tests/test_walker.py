@@ -0,0 +1,340 @@
+import asyncio
+import concurrent.futures
+import os
+import pathlib
+import sys
+import threading
+
+import pytest
+
+from pathlibutil import Path
+from pathlibutil.walker import Entry, awalk, scantree, scantree_parallel
+
+
+@pytest.fixture
+def tree(tmp_path: pathlib.Path) -> Path:
+    files = [
+        "file1.txt",
+        "subdir1/file2.txt",
+        "subdir2/",
+        "subdir3/file3.txt",
+        "subdir3/subdir31/file31.txt",
+        "subdir4/subdir41/",
+    ]
+
+    for file in map(tmp_path.joinpath, files):
+        if file.suffix:
+            file.parent.mkdir(parents=True, exist_ok=True)
+            file.write_text(file.name)
+        else:
+            file.mkdir(parents=True, exist_ok=True)
+
+    yield Path(tmp_path)
+
+
+def walk(root: Path):
+    for dirpath, _, filenames in os.walk(root):
+        yield from (os.path.join(dirpath, name) for name in filenames)
+
+
+def test_scantree(tree: Path):
+    entries = list(scantree(tree))
+
+    assert [e.path for e in entries] == list(walk(tree))
+    assert all(isinstance(e, Entry) for e in entries)
+    assert {e.name: e.depth for e in entries} == {
+        "file1.txt": 0,
+        "file2.txt": 1,
+        "file3.txt": 1,
+        "file31.txt": 2,
+    }
+
+
+def test_entry(tree: Path):
+    entry = next(scantree(tree, max_depth=0))
+
+    assert entry.is_file() and not entry.is_dir() and not entry.is_symlink()
+    assert entry.stat().st_size == len("file1.txt")
+    assert entry.inode() == os.stat(entry).st_ino
+    assert os.fspath(entry) == entry.path
+    assert repr(entry) == f"<Entry {entry.path!r}>"
+
+
+def test_entry_to_path(tree: Path, mocker):
+    spy = mocker.spy(Path, "__new__")
+    entries = list(tree.scantree())
+
+    assert spy.call_count == 0
+
+    path = entries[0].to_path()
+
+    assert type(path) is Path
+    assert path == Path(entries[0].path)
+    assert entries[0].to_path() is path
+
+
+@pytest.mark.parametrize(
+    "recursive, result",
+    [(False, 1), (True, 4), (0, 1), (1, 3), (2, 4)],
+)
+def test_path_scantree(tree: Path, recursive, result):
+    assert len(list(tree.scantree(recursive=recursive))) == result
+
+
+def test_scantree_exclude_dirs(tree: Path):
+    excluded = []
+
+    def exclude(entry: Entry) -> bool:
+        excluded.append(entry.name)
+        return entry.name == "subdir3"
+
+    names = [e.name for e in tree.scantree(exclude_dirs=exclude)]
+
+    assert names == ["file1.txt", "file2.txt"]
+    assert "subdir31" not in excluded
+
+
+def test_scantree_on_error(tmp_path: pathlib.Path):
+    errors = []
+
+    assert list(scantree(tmp_path / "missing", on_error=errors.append)) == []
+    assert isinstance(errors[0], FileNotFoundError)
+
+
+@pytest.mark.skipif(sys.platform == "win32", reason="symlinks need privileges")
+def test_scantree_symlinks(tree: Path):
+    tree.joinpath("link").symlink_to(tree / "subdir3", target_is_directory=True)
+
+    assert len(list(tree.scantree())) == 4
+    assert len(list(tree.scantree(follow_symlinks=True))) == 6
+
+
+def test_iterdir_cls(tree: Path, cls: Path):
+    files = list(cls(tree).iterdir(recursive=True, top_down=False))
+
+    assert all(type(f) is cls for f in files)
+    assert sorted(files) == sorted(cls(f) for f in walk(tree))
+
+
+@pytest.fixture
+def wide(tmp_path: pathlib.Path) -> Path:
+    for i in range(6):
+        for j in range(4):
+            folder = tmp_path.joinpath(f"d{i}", f"s{j}")
+            folder.mkdir(parents=True)
+            folder.joinpath("file.txt").write_text(f"{i}{j}")
+
+        tmp_path.joinpath(f"d{i}", "top.txt").write_text(str(i))
+
+    yield Path(tmp_path)
+
+
+@pytest.mark.parametrize("workers, pending", [(1, 1), (4, None), (8, 3)])
+def test_scantree_parallel_ordered(wide: Path, workers: int, pending):
+    entries = scantree_parallel(wide, workers=workers, ordered=True, pending=pending)
+
+    assert [e.path for e in entries] == [e.path for e in scantree(wide)]
+
+
+@pytest.mark.parametrize("workers", [1, 4])
+def test_scantree_parallel_unordered(wide: Path, workers: int):
+    entries = list(scantree_parallel(wide, workers=workers))
+
+    assert sorted(e.path for e in entries) == sorted(walk(wide))
+    assert len(entries) == 30
+
+
+def test_scantree_parallel_options(tree: Path):
+    excluded = []
+
+    def exclude(entry: Entry) -> bool:
+        excluded.append(threading.get_ident())
+        return entry.name == "subdir1"
+
+    entries = tree.scantree(workers=4, recursive=1, exclude_dirs=exclude)
+
+    assert sorted(e.name for e in entries) == ["file1.txt", "file3.txt"]
+    assert set(excluded) == {threading.get_ident()}
+
+
+def test_scantree_parallel_filters(tree: Path):
+    files = tree.iterdir(recursive=True, workers=2, ordered=True, exclude="subdir3/")
+
+    assert [f.name for f in files] == ["file1.txt", "file2.txt"]
+
+
+@pytest.mark.parametrize("ordered", [True, False])
+def test_scantree_parallel_on_error(tmp_path: pathlib.Path, ordered: bool):
+    errors = []
+    entries = scantree_parallel(
+        tmp_path / "missing", ordered=ordered, on_error=errors.append
+    )
+
+    assert list(entries) == []
+    assert isinstance(errors[0], FileNotFoundError)
+
+
+def test_scantree_parallel_close(wide: Path, mocker):
+    spy = mocker.spy(os, "scandir")
+    entries = scantree_parallel(wide, workers=1, pending=2)
+
+    next(entries)
+    entries.close()
+
+    assert spy.call_count < 1 + 6 + 24
+
+
+def test_scantree_parallel_raises(tree: Path):
+    with pytest.raises(ValueError):
+        next(scantree_parallel(tree, pending=0))
+
+
+@pytest.fixture
+def repo_tree(tmp_path: pathlib.Path) -> Path:
+    tmp_path.joinpath("src/build").mkdir(parents=True)
+    tmp_path.joinpath(".gitignore").write_text("build/\n*.log\n")
+    tmp_path.joinpath("debug.log").touch()
+    tmp_path.joinpath("src/main.py").touch()
+    tmp_path.joinpath("src/build/main.o").touch()
+
+    yield Path(tmp_path)
+
+
+def arun(agen) -> list:
+    async def collect():
+        return [item async for item in agen]
+
+    return asyncio.run(collect())
+
+
+@pytest.mark.parametrize("recursive", [True, 1])
+def test_aiterdir(wide: Path, recursive):
+    files = arun(wide.aiterdir(recursive=recursive, pending=3))
+
+    assert files == list(wide.iterdir(recursive=recursive))
+    assert all(type(f) is Path for f in files)
+
+
+def test_aiterdir_not_recursive(wide: Path):
+    assert sorted(arun(wide.aiterdir())) == sorted(wide.iterdir())
+
+
+def test_aiterdir_filters(tree: Path):
+    files = arun(
+        tree.aiterdir(
+            recursive=True,
+            exclude="file3.txt",
+            exclude_dirs=lambda p: p.name == "subdir1",
+        )
+    )
+
+    assert [f.name for f in files] == ["file1.txt", "file31.txt"]
+
+
+def test_aiterdir_raises(tree: Path):
+    with pytest.raises(TypeError):
+        arun(tree.aiterdir(recursive=True, exclude_dirs="subdir1"))
+
+    with pytest.raises(ValueError):
+        arun(tree.aiterdir(recursive=True, pending=0))
+
+
+@pytest.mark.parametrize("top_down", [True, False])
+def test_awalk(wide: Path, top_down: bool):
+    result = arun(wide.awalk(top_down, pending=4))
+
+    assert result == list(wide.walk(top_down))
+    assert all(type(dirpath) is Path for dirpath, *_ in result)
+
+
+def test_awalk_prune(wide: Path):
+    async def walk():
+        roots = []
+
+        async for dirpath, dirnames, _ in wide.awalk():
+            roots.append(dirpath)
+            dirnames[:] = [d for d in dirnames if d != "d0"]
+
+        return roots
+
+    roots = asyncio.run(walk())
+
+    assert len(roots) == 1 + 5 * 5
+    assert wide.joinpath("d0") not in roots
+
+
+def test_awalk_filters(repo_tree: Path):
+    result = arun(repo_tree.awalk(ignore=".gitignore"))
+
+    assert [(d.name, n, f) for d, n, f in result] == [
+        (repo_tree.name, ["src"], [".gitignore"]),
+        ("src", [], ["main.py"]),
+    ]
+
+
+def test_awalk_on_error(tmp_path: pathlib.Path):
+    errors = []
+
+    assert arun(awalk(tmp_path / "missing", on_error=errors.append)) == []
+    assert isinstance(errors[0], FileNotFoundError)
+
+
+@pytest.mark.skipif(sys.platform == "win32", reason="symlinks need privileges")
+def test_awalk_symlinks(tree: Path):
+    tree.joinpath("link").symlink_to(tree / "subdir3", target_is_directory=True)
+
+    for follow_symlinks in (True, False):
+        result = arun(tree.awalk(follow_symlinks=follow_symlinks))
+
+        assert result == list(tree.walk(follow_symlinks=follow_symlinks))
+
+
+@pytest.fixture
+def blocked(tmp_path: pathlib.Path, mocker):
+    """tree of 4 directories, only the top and the first other listing finish"""
+    tmp_path.joinpath("top.txt").touch()
+
+    for name in "abcd":
+        tmp_path.joinpath(name).mkdir()
+        tmp_path.joinpath(name, "file.txt").touch()
+
+    scandir = os.scandir
+    release = threading.Event()
+    calls = []
+
+    def listing(path):
+        calls.append(path)
+
+        if len(calls) > 2:
+            release.wait(5)
+
+        return scandir(path)
+
+    mocker.patch("os.scandir", side_effect=listing)
+
+    yield Path(tmp_path), release, calls
+
+
+@pytest.mark.parametrize("walk", ["aiterdir", "awalk"])
+def test_aclose_cancels_listings(blocked, walk: str):
+    root, release, calls = blocked
+    executor = concurrent.futures.ThreadPoolExecutor(1)
+
+    async def first_two():
+        asyncio.get_running_loop().set_default_executor(executor)
+
+        if walk == "aiterdir":
+            items = root.aiterdir(recursive=True, pending=3)
+        else:
+            items = root.awalk(pending=3)
+
+        result = [await items.__anext__(), await items.__anext__()]
+        await items.aclose()
+
+        release.set()
+        executor.shutdown(wait=True)
+
+        return result
+
+    assert len(asyncio.run(first_two())) == 2
+    assert len(calls) == 3